@@ -1,6 +1,8 @@
+import io
 from datetime import date
 
 import streamlit as st
+from pawpal_export import write_csv, write_ics
 from pawpal_system import Owner, Pet, Task, Scheduler
 
 if "owner" not in st.session_state:
@@ -165,6 +167,27 @@ if st.button("Generate schedule"):
             ]
         )
 
+        plan_entry = (st.session_state.owner, schedule_date, plan)
+        ics_buffer = io.StringIO(newline="")
+        write_ics(ics_buffer, [plan_entry], until=schedule_date)
+        csv_buffer = io.StringIO(newline="")
+        write_csv(csv_buffer, [plan_entry], until=schedule_date)
+        export_col1, export_col2 = st.columns(2)
+        with export_col1:
+            st.download_button(
+                "Download .ics",
+                ics_buffer.getvalue(),
+                file_name=f"pawpal-{schedule_date.isoformat()}.ics",
+                mime="text/calendar",
+            )
+        with export_col2:
+            st.download_button(
+                "Download .csv",
+                csv_buffer.getvalue(),
+                file_name=f"pawpal-{schedule_date.isoformat()}.csv",
+                mime="text/csv",
+            )
+
         same_time_conflicts = st.session_state.scheduler.same_time_conflicts
         overlap_conflicts = st.session_state.scheduler.detect_conflicts(plan)
 
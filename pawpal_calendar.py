@@ -0,0 +1,108 @@
+"""Calendar queue of tasks bucketed by the first date they become due.
+
+``Task.is_due`` makes a task due on every date from some start date onward
+(or never, for completed one-off tasks). ``DueCalendar`` stores each task in
+the bucket for that start date and keeps the bucket dates sorted, so date
+lookups touch only the buckets and tasks that are actually due. Tasks are
+moved between buckets when they are completed through the calendar; call
+``reschedule`` after changing a task any other way.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right, insort
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pawpal_system import Pet, Task
+
+ALWAYS = date.min
+
+RECURRENCE_DAYS = {"daily": 1, "weekly": 7}
+
+
+def due_from(task: Task) -> Optional[date]:
+	"""Return the first date task is due, ALWAYS, or None if never due."""
+	if task.recurrence is None:
+		return None if task.status == Task.STATUS_COMPLETED else ALWAYS
+	days = RECURRENCE_DAYS.get(task.recurrence)
+	if days is None or task.last_completed_date is None:
+		return ALWAYS
+	return task.last_completed_date + timedelta(days=days)
+
+
+class DueCalendar:
+	def __init__(self) -> None:
+		"""Initialize an empty calendar."""
+		self._buckets: Dict[date, Dict[int, Tuple[Pet, Task]]] = {}
+		self._dates: List[date] = []
+		self._where: Dict[int, date] = {}
+
+	@classmethod
+	def from_pets(cls, pets: Iterable[Pet]) -> "DueCalendar":
+		"""Build a calendar holding every task of the given pets."""
+		calendar = cls()
+		for pet in pets:
+			for task in pet.list_tasks():
+				calendar.add(pet, task)
+		return calendar
+
+	def __len__(self) -> int:
+		return len(self._where)
+
+	def add(self, pet: Pet, task: Task) -> None:
+		"""Bucket task under its next due date (no-op if it is never due)."""
+		self.remove(task)
+		start = due_from(task)
+		if start is None:
+			return
+		bucket = self._buckets.get(start)
+		if bucket is None:
+			bucket = self._buckets[start] = {}
+			insort(self._dates, start)
+		bucket[id(task)] = (pet, task)
+		self._where[id(task)] = start
+
+	def remove(self, task: Task) -> None:
+		"""Drop task from the calendar if present."""
+		start = self._where.pop(id(task), None)
+		if start is None:
+			return
+		bucket = self._buckets[start]
+		del bucket[id(task)]
+		if not bucket:
+			del self._buckets[start]
+			self._dates.pop(bisect_right(self._dates, start) - 1)
+
+	def reschedule(self, pet: Pet, task: Task) -> None:
+		"""Move task to the bucket matching its current state."""
+		self.add(pet, task)
+
+	def mark_completed(self, pet: Pet, task: Task, completed_on: Optional[date] = None) -> None:
+		"""Complete task and move it to its next due bucket."""
+		task.mark_completed(completed_on)
+		self.add(pet, task)
+
+	def due_on(self, on_date: date) -> List[Tuple[Pet, Task]]:
+		"""Return every (pet, task) for which task.is_due(on_date) holds."""
+		due: List[Tuple[Pet, Task]] = []
+		for start in self._dates[: bisect_right(self._dates, on_date)]:
+			due.extend(self._buckets[start].values())
+		return due
+
+	def due_between(self, start_date: date, end_date: date) -> List[Tuple[date, Pet, Task]]:
+		"""Return tasks due on any day in [start_date, end_date].
+
+		Each entry carries the first date in the range on which it is due.
+		"""
+		due: List[Tuple[date, Pet, Task]] = []
+		if end_date < start_date:
+			return due
+		for start in self._dates[: bisect_right(self._dates, end_date)]:
+			first_day = max(start, start_date)
+			due.extend((first_day, pet, task) for pet, task in self._buckets[start].values())
+		return due
+
+	def next_due_date(self, task: Task) -> Optional[date]:
+		"""Return the bucket date task is filed under, if any."""
+		return self._where.get(id(task))
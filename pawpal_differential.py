@@ -0,0 +1,272 @@
+"""Randomized differential testing of scheduling engines against the oracle.
+
+Cases are plain, immutable descriptions of pets and tasks so they can be
+rebuilt for every engine run, printed, and shrunk to a minimal reproduction
+when an engine disagrees with ``pawpal_reference``.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from pawpal_reference import (
+	reference_detect_conflicts,
+	reference_generate_daily_plan,
+	reference_sort_by_time,
+)
+from pawpal_system import Pet, Scheduler, Task, sort_by_time
+
+BASE_DATE = date(2024, 1, 1)
+
+# A handful of shared slots keeps due-time ties and overlaps common.
+DUE_TIME_CHOICES: Tuple[Optional[int], ...] = (None, None, 420, 450, 480, 480, 480, 510, 540, 1080)
+DURATION_CHOICES: Tuple[int, ...] = (5, 10, 15, 30, 30, 45, 60)
+STATUS_CHOICES: Tuple[str, ...] = (
+	Task.STATUS_PENDING,
+	Task.STATUS_PENDING,
+	Task.STATUS_IN_PROGRESS,
+	Task.STATUS_COMPLETED,
+)
+RECURRENCE_CHOICES: Tuple[Optional[str], ...] = (None, None, "daily", "weekly")
+
+Engine = Callable[["Case"], Hashable]
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+	name: str
+	duration: int
+	priority: int
+	status: str
+	due_time: Optional[int] = None
+	recurrence: Optional[str] = None
+	last_completed_offset: Optional[int] = None
+
+	def build(self) -> Task:
+		"""Create a fresh Task from this spec."""
+		last_completed = None
+		if self.last_completed_offset is not None:
+			last_completed = BASE_DATE + timedelta(days=self.last_completed_offset)
+		return Task(
+			name=self.name,
+			description="",
+			duration=self.duration,
+			priority=self.priority,
+			status=self.status,
+			due_time=self.due_time,
+			recurrence=self.recurrence,
+			last_completed_date=last_completed,
+		)
+
+
+@dataclass(frozen=True)
+class Case:
+	pets: Tuple[Tuple[str, Tuple[TaskSpec, ...]], ...]
+	availability: Optional[int] = None
+	pet_name: Optional[str] = None
+	status: Optional[str] = None
+	day_offset: int = 0
+
+	@property
+	def on_date(self) -> date:
+		"""Return the date the case is planned for."""
+		return BASE_DATE + timedelta(days=self.day_offset)
+
+	def build_pets(self) -> List[Pet]:
+		"""Create fresh Pet and Task objects for one engine run."""
+		pets: List[Pet] = []
+		for pet_name, task_specs in self.pets:
+			pet = Pet(name=pet_name)
+			for spec in task_specs:
+				pet.add_task(spec.build())
+			pets.append(pet)
+		return pets
+
+
+def random_case(rng: random.Random, *, max_pets: int = 4, max_tasks: int = 8) -> Case:
+	"""Generate a random case with recurrence, mixed statuses and tied due times."""
+	pets: List[Tuple[str, Tuple[TaskSpec, ...]]] = []
+	for pet_index in range(rng.randint(1, max_pets)):
+		specs: List[TaskSpec] = []
+		for task_index in range(rng.randint(0, max_tasks)):
+			recurrence = rng.choice(RECURRENCE_CHOICES)
+			last_completed_offset = None
+			if recurrence is not None and rng.random() < 0.7:
+				last_completed_offset = rng.randint(-8, 0)
+			specs.append(
+				TaskSpec(
+					name=f"task-{task_index}",
+					duration=rng.choice(DURATION_CHOICES),
+					priority=rng.randint(0, 3),
+					status=rng.choice(STATUS_CHOICES),
+					due_time=rng.choice(DUE_TIME_CHOICES),
+					recurrence=recurrence,
+					last_completed_offset=last_completed_offset,
+				)
+			)
+		pets.append((f"pet-{pet_index}", tuple(specs)))
+	return Case(
+		pets=tuple(pets),
+		availability=rng.choice((None, 30, 60, 120, 240)),
+		pet_name=rng.choice((None, None, "pet-0")),
+		status=rng.choice((None, None) + STATUS_CHOICES),
+		day_offset=rng.randint(0, 8),
+	)
+
+
+def _plan_keys(plan: Iterable[Tuple[Pet, Task]]) -> Tuple[Tuple[str, str], ...]:
+	return tuple((pet.name, task.name) for pet, task in plan)
+
+
+def _conflict_keys(conflicts: Iterable[Tuple[Pet, Task, Pet, Task]]) -> Tuple[Tuple[str, ...], ...]:
+	return tuple((pet_a.name, task_a.name, pet_b.name, task_b.name) for pet_a, task_a, pet_b, task_b in conflicts)
+
+
+def oracle_plan(case: Case) -> Hashable:
+	"""Plan and same-time conflicts from the reference implementation."""
+	plan, same_time = reference_generate_daily_plan(
+		case.build_pets(),
+		case.availability,
+		pet_name=case.pet_name,
+		status=case.status,
+		on_date=case.on_date,
+	)
+	return _plan_keys(plan), _conflict_keys(same_time)
+
+
+def scheduler_plan(case: Case) -> Hashable:
+	"""Plan and same-time conflicts from ``Scheduler.generate_daily_plan``."""
+	scheduler = Scheduler(availability=case.availability, pets=case.build_pets())
+	plan = scheduler.generate_daily_plan(pet_name=case.pet_name, status=case.status, on_date=case.on_date)
+	return _plan_keys(plan), _conflict_keys(scheduler.same_time_conflicts)
+
+
+def _all_pairs(case: Case) -> List[Tuple[Pet, Task]]:
+	return [(pet, task) for pet in case.build_pets() for task in pet.list_tasks()]
+
+
+def oracle_conflicts(case: Case) -> Hashable:
+	"""Overlap conflicts across every task, from the reference implementation."""
+	return _conflict_keys(reference_detect_conflicts(_all_pairs(case)))
+
+
+def scheduler_conflicts(case: Case) -> Hashable:
+	"""Overlap conflicts across every task, from ``Scheduler.detect_conflicts``."""
+	return _conflict_keys(Scheduler().detect_conflicts(_all_pairs(case)))
+
+
+def _sorted_keys(case: Case, sorter: Callable[[List[Task]], List[Task]]) -> Hashable:
+	pairs = _all_pairs(case)
+	owners: Dict[int, str] = {id(task): pet.name for pet, task in pairs}
+	return tuple((owners[id(task)], task.name) for task in sorter([task for _, task in pairs]))
+
+
+def oracle_sort(case: Case) -> Hashable:
+	"""Every task ordered by the reference ``sort_by_time``."""
+	return _sorted_keys(case, reference_sort_by_time)
+
+
+def system_sort(case: Case) -> Hashable:
+	"""Every task ordered by ``pawpal_system.sort_by_time``."""
+	return _sorted_keys(case, sort_by_time)
+
+
+ENGINE_PAIRS: Dict[str, Tuple[Engine, Engine]] = {
+	"generate_daily_plan": (oracle_plan, scheduler_plan),
+	"detect_conflicts": (oracle_conflicts, scheduler_conflicts),
+	"sort_by_time": (oracle_sort, system_sort),
+}
+
+
+def _simplifications(case: Case) -> Iterator[Case]:
+	"""Yield strictly simpler variants of a case, coarsest first."""
+	for index in range(len(case.pets)):
+		yield replace(case, pets=case.pets[:index] + case.pets[index + 1 :])
+	for pet_index, (pet_name, specs) in enumerate(case.pets):
+		for task_index in range(len(specs)):
+			smaller = specs[:task_index] + specs[task_index + 1 :]
+			yield _with_specs(case, pet_index, pet_name, smaller)
+	if case.availability is not None:
+		yield replace(case, availability=None)
+	if case.pet_name is not None:
+		yield replace(case, pet_name=None)
+	if case.status is not None:
+		yield replace(case, status=None)
+	if case.day_offset != 0:
+		yield replace(case, day_offset=0)
+	simple = TaskSpec(name="", duration=1, priority=0, status=Task.STATUS_PENDING)
+	for pet_index, (pet_name, specs) in enumerate(case.pets):
+		for task_index, spec in enumerate(specs):
+			for field_name in ("due_time", "recurrence", "last_completed_offset", "priority", "duration", "status"):
+				target = getattr(simple, field_name)
+				if getattr(spec, field_name) == target:
+					continue
+				new_spec = replace(spec, **{field_name: target})
+				new_specs = specs[:task_index] + (new_spec,) + specs[task_index + 1 :]
+				yield _with_specs(case, pet_index, pet_name, new_specs)
+
+
+def _with_specs(case: Case, pet_index: int, pet_name: str, specs: Tuple[TaskSpec, ...]) -> Case:
+	pets = case.pets[:pet_index] + ((pet_name, specs),) + case.pets[pet_index + 1 :]
+	return replace(case, pets=pets)
+
+
+def shrink(case: Case, fails: Callable[[Case], bool]) -> Case:
+	"""Greedily simplify a failing case until no simpler variant still fails."""
+	progress = True
+	while progress:
+		progress = False
+		for candidate in _simplifications(case):
+			if fails(candidate):
+				case = candidate
+				progress = True
+				break
+	return case
+
+
+def find_counterexample(
+	oracle: Engine,
+	candidate: Engine,
+	*,
+	seeds: Iterable[int] = range(200),
+	max_pets: int = 4,
+	max_tasks: int = 8,
+) -> Optional[Tuple[Case, Hashable, Hashable]]:
+	"""Return a shrunk case where candidate disagrees with oracle, or None."""
+
+	def fails(case: Case) -> bool:
+		return oracle(case) != candidate(case)
+
+	for seed in seeds:
+		case = random_case(random.Random(seed), max_pets=max_pets, max_tasks=max_tasks)
+		if fails(case):
+			minimal = shrink(case, fails)
+			return minimal, oracle(minimal), candidate(minimal)
+	return None
+
+
+def assert_matches_oracle(
+	oracle: Engine,
+	candidate: Engine,
+	*,
+	seeds: Iterable[int] = range(200),
+	max_pets: int = 4,
+	max_tasks: int = 8,
+) -> None:
+	"""Raise AssertionError with a minimal reproduction if the engines disagree."""
+	counterexample = find_counterexample(
+		oracle,
+		candidate,
+		seeds=seeds,
+		max_pets=max_pets,
+		max_tasks=max_tasks,
+	)
+	if counterexample is None:
+		return
+	case, expected, actual = counterexample
+	raise AssertionError(
+		f"engine disagrees with oracle\n  case: {case!r}\n  expected: {expected!r}\n  actual: {actual!r}"
+	)
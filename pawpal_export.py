@@ -0,0 +1,231 @@
+"""Streaming iCalendar and CSV export of generated plans.
+
+Plans are consumed one at a time as ``(owner, date, plan)`` entries and each
+``(pet, task)`` is written out immediately, so memory does not grow with the
+number of households or dates. Daily and weekly tasks become a single event
+with an RRULE the first time they appear for an owner; later appearances for
+the same owner are skipped instead of being expanded day by day. Entries are
+expected to be grouped by owner, as ``iter_plans`` produces them. Pass
+``until`` (normally the last exported date) to bound those RRULEs.
+
+UIDs are derived from an owner key rather than the owner's position, so
+re-exporting a reordered or filtered set of households keeps each event's
+UID. The key defaults to the owner's name; pass ``owner_key`` to tell apart
+households that share one.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Callable, Iterable, Iterator, List, Mapping, Optional, Set, TextIO, Tuple, Union
+
+from pawpal_system import Owner, Pet, Scheduler, Task, WindowSpec
+
+PlanEntry = Tuple[Owner, date, List[Tuple[Pet, Task]]]
+Target = Union[str, TextIO]
+OwnerKey = Callable[[Owner], str]
+
+RRULES = {"daily": "FREQ=DAILY", "weekly": "FREQ=WEEKLY"}
+PRODID = "-//PawPal+//Plan Export//EN"
+CSV_COLUMNS = (
+	"owner",
+	"date",
+	"pet",
+	"task",
+	"description",
+	"start",
+	"duration_minutes",
+	"priority",
+	"status",
+	"rrule",
+)
+
+
+@dataclass
+class PlanEvent:
+	owner: Owner
+	owner_key: str
+	pet: Pet
+	task: Task
+	on_date: date
+	rrule: Optional[str]
+
+	@property
+	def uid(self) -> str:
+		"""Identifier unique within an export; recurring events omit their date."""
+		parts = [self.owner_key, self.pet.name, self.task.name]
+		if self.rrule is None:
+			parts.append(self.on_date.isoformat())
+		digest = hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+		return f"{digest}@pawpal"
+
+
+def iter_plans(
+	owners: Iterable[Owner],
+	dates: Iterable[date],
+	*,
+	availability: Optional[int] = None,
+	availability_windows: Optional[Union[WindowSpec, Mapping[date, WindowSpec]]] = None,
+) -> Iterator[PlanEntry]:
+	"""Lazily generate each owner's plan for every date, grouped by owner."""
+	date_list = list(dates)
+	for owner in owners:
+		scheduler = Scheduler(
+			availability=availability,
+			pets=owner.owned_pets,
+			availability_windows=availability_windows,
+		)
+		for on_date in date_list:
+			yield owner, on_date, scheduler.generate_daily_plan(on_date=on_date)
+
+
+def _rrule(task: Task, until: Optional[date]) -> Optional[str]:
+	rrule = RRULES.get(task.recurrence or "")
+	if rrule is None or until is None:
+		return rrule
+	# UNTIL must match DTSTART's value type: a date for all-day events,
+	# otherwise a floating date-time covering the whole last day.
+	if task.due_time is None:
+		return f"{rrule};UNTIL={until:%Y%m%d}"
+	return f"{rrule};UNTIL={until:%Y%m%d}T235959"
+
+
+def _owner_name(owner: Owner) -> str:
+	return owner.name
+
+
+def iter_events(
+	plans: Iterable[PlanEntry],
+	*,
+	until: Optional[date] = None,
+	owner_key: OwnerKey = _owner_name,
+) -> Iterator[PlanEvent]:
+	"""Turn plans into events, emitting each recurring task once per owner."""
+	current_owner: Optional[Owner] = None
+	current_key = ""
+	seen: Set[Tuple[str, str]] = set()
+	for owner, on_date, plan in plans:
+		if owner is not current_owner:
+			current_owner = owner
+			current_key = owner_key(owner)
+			seen.clear()
+		for pet, task in plan:
+			rrule = _rrule(task, until)
+			if rrule is not None:
+				key = (pet.name, task.name)
+				if key in seen:
+					continue
+				seen.add(key)
+			yield PlanEvent(owner=owner, owner_key=current_key, pet=pet, task=task, on_date=on_date, rrule=rrule)
+
+
+def _escape_text(value: str) -> str:
+	return (
+		value.replace("\\", "\\\\")
+		.replace(";", "\\;")
+		.replace(",", "\\,")
+		.replace("\r\n", "\\n")
+		.replace("\n", "\\n")
+	)
+
+
+def _fold(line: str) -> str:
+	"""Fold a content line at 75 octets as required by RFC 5545."""
+	encoded = line.encode("utf-8")
+	if len(encoded) <= 75:
+		return line + "\r\n"
+	chunks: List[str] = []
+	start = 0
+	limit = 75
+	while start < len(encoded):
+		end = min(start + limit, len(encoded))
+		while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+			end -= 1
+		chunks.append(encoded[start:end].decode("utf-8"))
+		start = end
+		limit = 74
+	return "\r\n ".join(chunks) + "\r\n"
+
+
+def _event_lines(event: PlanEvent, stamp: str) -> Iterator[str]:
+	task = event.task
+	yield "BEGIN:VEVENT"
+	yield f"UID:{event.uid}"
+	yield f"DTSTAMP:{stamp}"
+	if task.due_time is None:
+		yield f"DTSTART;VALUE=DATE:{event.on_date:%Y%m%d}"
+	else:
+		hours, minutes = divmod(task.due_time, 60)
+		yield f"DTSTART:{event.on_date:%Y%m%d}T{hours:02d}{minutes:02d}00"
+		yield f"DURATION:PT{task.duration}M"
+	if event.rrule is not None:
+		yield f"RRULE:{event.rrule}"
+	yield f"SUMMARY:{_escape_text(f'{event.pet.name}: {task.name}')}"
+	if task.description:
+		yield f"DESCRIPTION:{_escape_text(task.description)}"
+	yield f"CATEGORIES:{_escape_text(event.owner.name)}"
+	yield "END:VEVENT"
+
+
+def write_ics(
+	target: Target,
+	plans: Iterable[PlanEntry],
+	*,
+	until: Optional[date] = None,
+	stamp: Optional[datetime] = None,
+	owner_key: OwnerKey = _owner_name,
+) -> int:
+	"""Stream plans to an iCalendar file or text stream; return events written."""
+	if isinstance(target, str):
+		with open(target, "w", encoding="utf-8", newline="") as stream:
+			return write_ics(stream, plans, until=until, stamp=stamp, owner_key=owner_key)
+	stamp_text = (stamp or datetime.now(timezone.utc)).astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+	target.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n")
+	target.write(_fold(f"PRODID:{PRODID}"))
+	count = 0
+	for event in iter_events(plans, until=until, owner_key=owner_key):
+		target.write("".join(_fold(line) for line in _event_lines(event, stamp_text)))
+		count += 1
+	target.write("END:VCALENDAR\r\n")
+	return count
+
+
+def write_csv(
+	target: Target,
+	plans: Iterable[PlanEntry],
+	*,
+	until: Optional[date] = None,
+	owner_key: OwnerKey = _owner_name,
+) -> int:
+	"""Stream plans to a CSV file or text stream; return rows written."""
+	if isinstance(target, str):
+		with open(target, "w", encoding="utf-8", newline="") as stream:
+			return write_csv(stream, plans, until=until, owner_key=owner_key)
+	writer = csv.writer(target)
+	writer.writerow(CSV_COLUMNS)
+	count = 0
+	for event in iter_events(plans, until=until, owner_key=owner_key):
+		task = event.task
+		start = ""
+		if task.due_time is not None:
+			hours, minutes = divmod(task.due_time, 60)
+			start = f"{hours:02d}:{minutes:02d}"
+		writer.writerow(
+			(
+				event.owner.name,
+				event.on_date.isoformat(),
+				event.pet.name,
+				task.name,
+				task.description,
+				start,
+				task.duration,
+				task.priority,
+				task.status,
+				event.rrule or "",
+			)
+		)
+		count += 1
+	return count
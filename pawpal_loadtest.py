@@ -0,0 +1,257 @@
+"""Headless rerun latency load test for the Streamlit app.
+
+Seeds ``st.session_state`` with synthetic households of increasing size,
+drives scripted interactions through Streamlit's ``AppTest`` and records how
+long each rerun takes (untraced) and how much memory it allocates at peak
+(in a separate tracemalloc pass). Run it as a script to print a scaling
+report::
+
+	python pawpal_loadtest.py --sizes 10x10,50x20,200x20 --budget-ms 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pawpal_system import Owner, Pet, Scheduler, Task
+
+DEFAULT_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+DEFAULT_SIZES: Tuple[Tuple[int, int], ...] = ((5, 10), (25, 20), (100, 20))
+PRIORITY_LABELS = {1: "low", 2: "medium", 3: "high"}
+
+
+@dataclass
+class RerunSample:
+	interaction: str
+	pets: int
+	tasks_per_pet: int
+	seconds: float
+	peak_bytes: int
+
+
+def synthetic_session_state(pets: int, tasks_per_pet: int, *, seed: int = 0) -> Dict[str, Any]:
+	"""Build the session_state entries app.py expects for a large household."""
+	rng = random.Random(seed)
+	owner = Owner(name="Load Test")
+	pets_by_name: Dict[str, Pet] = {}
+	rows: List[Dict[str, Any]] = []
+	for pet_index in range(pets):
+		pet = Pet(name=f"pet-{pet_index}")
+		owner.add_pet(pet)
+		pets_by_name[pet.name] = pet
+		for task_index in range(tasks_per_pet):
+			priority = rng.randint(1, 3)
+			task = Task(
+				name=f"task-{task_index}",
+				description="synthetic care task",
+				duration=rng.choice((5, 10, 15, 30)),
+				priority=priority,
+				status=Task.STATUS_PENDING,
+				due_time=rng.choice((None, rng.randrange(6 * 60, 22 * 60, 15))),
+				recurrence=rng.choice((None, "daily", "weekly")),
+			)
+			pet.add_task(task)
+			rows.append(
+				{
+					"pet": pet.name,
+					"title": task.name,
+					"duration_minutes": task.duration,
+					"priority": PRIORITY_LABELS[priority],
+				}
+			)
+	return {
+		"owner": owner,
+		"scheduler": Scheduler(availability=120, pets=list(pets_by_name.values())),
+		"pets": pets_by_name,
+		"tasks": rows,
+	}
+
+
+def _by_label(widgets: Iterable[Any], label: str) -> Any:
+	for widget in widgets:
+		if widget.label == label:
+			return widget
+	raise LookupError(f"no widget labelled {label!r}")
+
+
+def _add_pet(app: Any, step: int) -> None:
+	_by_label(app.text_input, "Pet name").set_value(f"new-pet-{step}")
+	_by_label(app.button, "Add pet").click()
+
+
+def _add_task(app: Any, step: int) -> None:
+	_by_label(app.text_input, "Pet name").set_value("pet-0")
+	_by_label(app.text_input, "Task title").set_value(f"new-task-{step}")
+	_by_label(app.button, "Add task").click()
+
+
+def _generate_schedule(app: Any, step: int) -> None:
+	_by_label(app.button, "Generate schedule").click()
+
+
+INTERACTIONS: Dict[str, Callable[[Any, int], None]] = {
+	"add_pet": _add_pet,
+	"add_task": _add_task,
+	"generate_schedule": _generate_schedule,
+}
+
+
+def _replay(
+	app_test: Any,
+	app_path: str,
+	state: Dict[str, Any],
+	interactions: Sequence[str],
+	timeout: float,
+	*,
+	traced: bool,
+) -> List[float]:
+	"""Replay interactions on a fresh app; return seconds, or peak bytes if traced."""
+	app = app_test.from_file(os.path.abspath(app_path), default_timeout=timeout)
+	for key, value in state.items():
+		app.session_state[key] = value
+	app.run()
+	results: List[float] = []
+	for step, name in enumerate(interactions):
+		INTERACTIONS[name](app, step)
+		if traced:
+			tracemalloc.start()
+			try:
+				app.run()
+				_, peak = tracemalloc.get_traced_memory()
+			finally:
+				tracemalloc.stop()
+			results.append(peak)
+		else:
+			started = time.perf_counter()
+			app.run()
+			results.append(time.perf_counter() - started)
+		if app.exception:
+			raise RuntimeError(f"{name} rerun raised: {app.exception[0].message}")
+	return results
+
+
+def measure(
+	pets: int,
+	tasks_per_pet: int,
+	*,
+	app_path: str = DEFAULT_APP,
+	interactions: Sequence[str] = tuple(INTERACTIONS),
+	repeats: int = 3,
+	timeout: float = 60.0,
+) -> List[RerunSample]:
+	"""Time each scripted interaction's rerun for one household size.
+
+	Latency comes from an untraced pass; peak memory from a second pass of
+	the same interactions under tracemalloc, whose overhead would otherwise
+	inflate the timings.
+	"""
+	from streamlit.testing.v1 import AppTest
+
+	samples: List[RerunSample] = []
+	for repeat in range(repeats):
+		timings = _replay(
+			AppTest,
+			app_path,
+			synthetic_session_state(pets, tasks_per_pet, seed=repeat),
+			interactions,
+			timeout,
+			traced=False,
+		)
+		peaks = _replay(
+			AppTest,
+			app_path,
+			synthetic_session_state(pets, tasks_per_pet, seed=repeat),
+			interactions,
+			timeout,
+			traced=True,
+		)
+		for name, seconds, peak in zip(interactions, timings, peaks):
+			samples.append(RerunSample(name, pets, tasks_per_pet, seconds, int(peak)))
+	return samples
+
+
+def run_load_test(
+	sizes: Iterable[Tuple[int, int]] = DEFAULT_SIZES,
+	**kwargs: Any,
+) -> List[RerunSample]:
+	"""Measure every household size in turn."""
+	samples: List[RerunSample] = []
+	for pets, tasks_per_pet in sizes:
+		samples.extend(measure(pets, tasks_per_pet, **kwargs))
+	return samples
+
+
+def summarize(samples: Iterable[RerunSample]) -> List[Dict[str, Any]]:
+	"""Group samples by interaction and size with median latency and peak memory."""
+	groups: Dict[Tuple[str, int, int], List[RerunSample]] = {}
+	for sample in samples:
+		groups.setdefault((sample.interaction, sample.pets, sample.tasks_per_pet), []).append(sample)
+	rows: List[Dict[str, Any]] = []
+	baselines: Dict[str, float] = {}
+	ordered = sorted(groups.items(), key=lambda item: (item[0][0], item[0][1] * item[0][2]))
+	for (interaction, pets, tasks_per_pet), group in ordered:
+		median_ms = statistics.median(sample.seconds for sample in group) * 1000
+		baseline = baselines.setdefault(interaction, median_ms)
+		rows.append(
+			{
+				"interaction": interaction,
+				"pets": pets,
+				"tasks": pets * tasks_per_pet,
+				"median_ms": median_ms,
+				"max_ms": max(sample.seconds for sample in group) * 1000,
+				"peak_kib": max(sample.peak_bytes for sample in group) / 1024,
+				"vs_smallest": median_ms / baseline if baseline else 1.0,
+			}
+		)
+	return rows
+
+
+def format_report(rows: Iterable[Dict[str, Any]]) -> str:
+	"""Render summary rows as a fixed-width text table."""
+	lines = [
+		f"{'interaction':<18} | {'pets':>6} | {'tasks':>8} | {'median ms':>10} | {'max ms':>10} | {'peak KiB':>10} | {'x smallest':>10}",
+	]
+	lines.append("-" * len(lines[0]))
+	for row in rows:
+		lines.append(
+			f"{row['interaction']:<18} | {row['pets']:>6} | {row['tasks']:>8} | {row['median_ms']:>10.1f} | "
+			f"{row['max_ms']:>10.1f} | {row['peak_kib']:>10.0f} | {row['vs_smallest']:>10.2f}"
+		)
+	return "\n".join(lines)
+
+
+def _parse_sizes(text: str) -> List[Tuple[int, int]]:
+	sizes: List[Tuple[int, int]] = []
+	for part in text.split(","):
+		pets, _, tasks_per_pet = part.strip().partition("x")
+		sizes.append((int(pets), int(tasks_per_pet)))
+	return sizes
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Measure app.py rerun latency as households grow.")
+	parser.add_argument("--app", default=DEFAULT_APP, help="Streamlit script to drive")
+	parser.add_argument("--sizes", type=_parse_sizes, default=list(DEFAULT_SIZES), help="PETSxTASKS_PER_PET,...")
+	parser.add_argument("--repeats", type=int, default=3)
+	parser.add_argument("--budget-ms", type=float, default=None, help="fail if any median rerun exceeds this")
+	args = parser.parse_args(argv)
+
+	rows = summarize(run_load_test(args.sizes, app_path=args.app, repeats=args.repeats))
+	print(format_report(rows))
+	if args.budget_ms is not None:
+		over = [row for row in rows if row["median_ms"] > args.budget_ms]
+		if over:
+			print(f"\n{len(over)} measurement(s) exceeded the {args.budget_ms:.0f} ms budget")
+			return 1
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
@@ -0,0 +1,187 @@
+"""Multi-criteria task queries compiled to predicates and served from indexes.
+
+A ``TaskQuery`` describes the tasks to find. ``compile()`` turns it into a
+``CompiledQuery`` whose predicate only checks the criteria that were set.
+Running it against a ``TaskIndex`` narrows the candidates with the most
+selective index first and reports which one was used.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from pawpal_system import Pet, Task
+
+Pair = Tuple[Pet, Task]
+Predicate = Callable[[Pet, Task], bool]
+
+FULL_SCAN = "full_scan"
+
+
+def _frozen(values: Optional[Iterable]) -> Optional[FrozenSet]:
+	if values is None:
+		return None
+	# A bare string is one value, not a set of its characters.
+	if isinstance(values, str):
+		return frozenset((values,))
+	return frozenset(values)
+
+
+@dataclass(frozen=True)
+class TaskQuery:
+	"""Criteria for selecting tasks; unset criteria match everything.
+
+	due_window is a half-open [start, end) range of minutes; tasks without a
+	due time never match it. recurrences may contain None for one-off tasks.
+	A single string passed for a set-valued criterion is treated as one value.
+	"""
+
+	statuses: Optional[FrozenSet[str]] = None
+	pet_names: Optional[FrozenSet[str]] = None
+	min_priority: Optional[int] = None
+	max_priority: Optional[int] = None
+	due_window: Optional[Tuple[int, int]] = None
+	min_duration: Optional[int] = None
+	max_duration: Optional[int] = None
+	recurrences: Optional[FrozenSet[Optional[str]]] = None
+
+	def __post_init__(self) -> None:
+		"""Normalize set-valued criteria to frozensets."""
+		object.__setattr__(self, "statuses", _frozen(self.statuses))
+		object.__setattr__(self, "pet_names", _frozen(self.pet_names))
+		object.__setattr__(self, "recurrences", _frozen(self.recurrences))
+
+	def compile(self) -> "CompiledQuery":
+		"""Build the predicate once for repeated evaluation."""
+		checks: List[Predicate] = []
+		if self.statuses is not None:
+			statuses = self.statuses
+			checks.append(lambda pet, task: task.status in statuses)
+		if self.pet_names is not None:
+			pet_names = self.pet_names
+			checks.append(lambda pet, task: pet.name in pet_names)
+		if self.min_priority is not None:
+			min_priority = self.min_priority
+			checks.append(lambda pet, task: task.priority >= min_priority)
+		if self.max_priority is not None:
+			max_priority = self.max_priority
+			checks.append(lambda pet, task: task.priority <= max_priority)
+		if self.due_window is not None:
+			start, end = self.due_window
+			checks.append(lambda pet, task: task.due_time is not None and start <= task.due_time < end)
+		if self.min_duration is not None:
+			min_duration = self.min_duration
+			checks.append(lambda pet, task: task.duration >= min_duration)
+		if self.max_duration is not None:
+			max_duration = self.max_duration
+			checks.append(lambda pet, task: task.duration <= max_duration)
+		if self.recurrences is not None:
+			recurrences = self.recurrences
+			checks.append(lambda pet, task: task.recurrence in recurrences)
+
+		if not checks:
+			predicate: Predicate = lambda pet, task: True
+		elif len(checks) == 1:
+			predicate = checks[0]
+		else:
+			predicate = lambda pet, task: all(check(pet, task) for check in checks)
+		return CompiledQuery(query=self, predicate=predicate)
+
+
+@dataclass
+class QueryResult:
+	pairs: List[Pair]
+	index_used: str
+	candidates_scanned: int
+
+
+@dataclass
+class TaskIndex:
+	"""Point-in-time indexes over (pet, task) pairs; rebuild after edits."""
+
+	pairs: List[Pair]
+	by_status: Dict[str, List[int]] = field(default_factory=dict)
+	by_pet: Dict[str, List[int]] = field(default_factory=dict)
+	by_recurrence: Dict[Optional[str], List[int]] = field(default_factory=dict)
+	due_times: List[int] = field(default_factory=list)
+	due_positions: List[int] = field(default_factory=list)
+
+	@classmethod
+	def from_pets(cls, pets: Iterable[Pet]) -> "TaskIndex":
+		"""Index every task of the given pets."""
+		return cls.from_pairs((pet, task) for pet in pets for task in pet.list_tasks())
+
+	@classmethod
+	def from_pairs(cls, pairs: Iterable[Pair]) -> "TaskIndex":
+		"""Index an iterable of (pet, task) pairs."""
+		index = cls(pairs=list(pairs))
+		timed: List[Tuple[int, int]] = []
+		for position, (pet, task) in enumerate(index.pairs):
+			index.by_status.setdefault(task.status, []).append(position)
+			index.by_pet.setdefault(pet.name, []).append(position)
+			index.by_recurrence.setdefault(task.recurrence, []).append(position)
+			if task.due_time is not None:
+				timed.append((task.due_time, position))
+		timed.sort()
+		index.due_times = [due_time for due_time, _ in timed]
+		index.due_positions = [position for _, position in timed]
+		return index
+
+	def _bucket_candidates(self, buckets: Dict, keys: FrozenSet) -> List[int]:
+		positions: List[int] = []
+		for key in keys:
+			positions.extend(buckets.get(key, ()))
+		return positions
+
+	def candidates(self, query: TaskQuery) -> Tuple[str, Optional[List[int]]]:
+		"""Return the most selective index for a query and its positions."""
+		options: List[Tuple[int, str, Callable[[], List[int]]]] = []
+		if query.statuses is not None:
+			statuses = query.statuses
+			size = sum(len(self.by_status.get(status, ())) for status in statuses)
+			options.append((size, "status", lambda: self._bucket_candidates(self.by_status, statuses)))
+		if query.pet_names is not None:
+			pet_names = query.pet_names
+			size = sum(len(self.by_pet.get(name, ())) for name in pet_names)
+			options.append((size, "pet", lambda: self._bucket_candidates(self.by_pet, pet_names)))
+		if query.recurrences is not None:
+			recurrences = query.recurrences
+			size = sum(len(self.by_recurrence.get(value, ())) for value in recurrences)
+			options.append((size, "recurrence", lambda: self._bucket_candidates(self.by_recurrence, recurrences)))
+		if query.due_window is not None:
+			low = bisect_left(self.due_times, query.due_window[0])
+			high = max(low, bisect_left(self.due_times, query.due_window[1]))
+			options.append((high - low, "due_time", lambda: self.due_positions[low:high]))
+		if not options:
+			return FULL_SCAN, None
+		_, name, fetch = min(options, key=lambda option: option[0])
+		return name, fetch()
+
+
+@dataclass
+class CompiledQuery:
+	query: TaskQuery
+	predicate: Predicate
+
+	def run(self, source: Union[Iterable[Pair], "TaskIndex"]) -> QueryResult:
+		"""Evaluate against an index, or scan an iterable of (pet, task) pairs."""
+		if not isinstance(source, TaskIndex):
+			pairs = list(source)
+			return QueryResult(
+				pairs=[pair for pair in pairs if self.predicate(*pair)],
+				index_used=FULL_SCAN,
+				candidates_scanned=len(pairs),
+			)
+		index_used, positions = source.candidates(self.query)
+		if positions is None:
+			candidates = source.pairs
+		else:
+			positions.sort()
+			candidates = [source.pairs[position] for position in positions]
+		return QueryResult(
+			pairs=[pair for pair in candidates if self.predicate(*pair)],
+			index_used=index_used,
+			candidates_scanned=len(candidates),
+		)
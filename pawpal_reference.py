@@ -0,0 +1,138 @@
+"""Frozen reference implementations of the PawPal scheduling algorithms.
+
+These are verbatim copies of the straightforward loop-based versions of
+``sort_by_time``, ``Scheduler.generate_daily_plan`` (minute-budget packing),
+``Scheduler.detect_conflicts`` and ``Task.is_due``. They act as the oracle for
+the differential tests and must not be optimized or otherwise changed.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pawpal_system import Pet, Task
+
+Conflict = Tuple[Pet, Task, Pet, Task]
+
+
+def reference_sort_by_time(tasks: Iterable[Task]) -> List[Task]:
+	"""Return tasks sorted by due time, placing unscheduled tasks last."""
+	return sorted(
+		tasks,
+		key=lambda task: (
+			task.due_time is None,
+			task.due_time if task.due_time is not None else 0,
+		),
+	)
+
+
+def reference_is_due(task: Task, on_date: date) -> bool:
+	"""Return True if the task should be scheduled on the given date."""
+	if task.status == Task.STATUS_COMPLETED and task.recurrence is None:
+		return False
+	if task.recurrence is None:
+		return task.status != Task.STATUS_COMPLETED
+	if task.recurrence == "daily":
+		if task.last_completed_date is None:
+			return True
+		return on_date >= task.last_completed_date + timedelta(days=1)
+	if task.recurrence == "weekly":
+		if task.last_completed_date is None:
+			return True
+		return on_date >= task.last_completed_date + timedelta(days=7)
+	return True
+
+
+def reference_collect_tasks(
+	pets: Iterable[Pet],
+	*,
+	pet_name: Optional[str],
+	status: Optional[str],
+	on_date: Optional[date],
+) -> List[Tuple[Pet, Task]]:
+	"""Collect tasks across pets with optional filters."""
+	target_date = on_date or date.today()
+	collected: List[Tuple[Pet, Task]] = []
+	for pet in pets:
+		if pet_name and pet.name != pet_name:
+			continue
+		for task in pet.list_tasks():
+			if status is None and task.status == Task.STATUS_COMPLETED:
+				continue
+			if status is not None and task.status != status:
+				continue
+			if not reference_is_due(task, target_date):
+				continue
+			collected.append((pet, task))
+	return collected
+
+
+def reference_detect_same_time_conflicts(plan: Iterable[Tuple[Pet, Task]]) -> List[Conflict]:
+	"""Detect tasks that share the same due time."""
+	conflicts: List[Conflict] = []
+	seen: Dict[int, Tuple[Pet, Task]] = {}
+	for pet, task in plan:
+		if task.due_time is None:
+			continue
+		if task.due_time in seen:
+			other_pet, other_task = seen[task.due_time]
+			conflicts.append((other_pet, other_task, pet, task))
+		else:
+			seen[task.due_time] = (pet, task)
+	return conflicts
+
+
+def reference_generate_daily_plan(
+	pets: Iterable[Pet],
+	availability: Optional[int],
+	*,
+	pet_name: Optional[str] = None,
+	status: Optional[str] = None,
+	on_date: Optional[date] = None,
+) -> Tuple[List[Tuple[Pet, Task]], List[Conflict]]:
+	"""Return the plan and its same-time conflicts for a minute budget."""
+	available_minutes = availability if isinstance(availability, int) else None
+	plan_candidates = reference_collect_tasks(pets, pet_name=pet_name, status=status, on_date=on_date)
+
+	plan_candidates.sort(
+		key=lambda item: (
+			item[1].due_time is None,
+			item[1].due_time if item[1].due_time is not None else 0,
+			-item[1].priority,
+			item[1].duration,
+		)
+	)
+
+	if available_minutes is None:
+		return plan_candidates, reference_detect_same_time_conflicts(plan_candidates)
+
+	plan: List[Tuple[Pet, Task]] = []
+	used_minutes = 0
+	for pet, task in plan_candidates:
+		if used_minutes + task.duration > available_minutes:
+			continue
+		plan.append((pet, task))
+		used_minutes += task.duration
+
+	return plan, reference_detect_same_time_conflicts(plan)
+
+
+def reference_detect_conflicts(plan: Iterable[Tuple[Pet, Task]]) -> List[Conflict]:
+	"""Detect time conflicts in a plan with explicit start times."""
+	timed_tasks = [item for item in plan if item[1].due_time is not None]
+	timed_tasks.sort(key=lambda item: item[1].due_time)
+	conflicts: List[Conflict] = []
+	current_end: Optional[int] = None
+	current_item: Optional[Tuple[Pet, Task]] = None
+	for pet, task in timed_tasks:
+		start_time = task.due_time
+		if start_time is None:
+			continue
+		if current_end is not None and start_time < current_end and current_item is not None:
+			conflicts.append((current_item[0], current_item[1], pet, task))
+		end_time = start_time + task.duration
+		if current_end is None or end_time > current_end:
+			current_end = end_time
+			current_item = (pet, task)
+	return conflicts
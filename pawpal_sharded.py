@@ -0,0 +1,414 @@
+"""Sharded, multi-process task store with task columns in shared memory.
+
+Owners are assigned to worker processes by a stable hash of their name.
+Each worker holds the ``Owner``/``Pet``/``Task`` objects for its owners,
+serves planning and mutation calls for them, and mirrors every task into
+int32 columns in a ``multiprocessing.shared_memory`` block. The parent can
+read those columns in place (see ``ShardColumns``) without copying or a
+round trip to the worker. When a shard outgrows its block it copies the
+columns into a larger one and marks the old block retired, so views still
+attached to it fail loudly instead of returning stale values. Cross-shard
+queries are sent to every worker at once and the sorted per-shard answers
+are merged.
+"""
+
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+from collections import Counter
+from datetime import date
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from pawpal_system import Owner, Pet, Scheduler, Task, WindowSpec
+
+COLUMNS = ("duration", "priority", "due_time", "status", "recurrence", "last_completed")
+STATUS_CODES = {Task.STATUS_PENDING: 0, Task.STATUS_IN_PROGRESS: 1, Task.STATUS_COMPLETED: 2}
+RECURRENCE_CODES = {None: 0, "daily": 1, "weekly": 2}
+OTHER_CODE = 3
+NO_DUE_TIME = -(2**31)
+ITEM_SIZE = 4
+INITIAL_CAPACITY = 1024
+# Each block starts with [generation, retired] before the columns.
+HEADER_ITEMS = 2
+RETIRED = 1
+STOP_TIMEOUT = 5.0
+
+TaskKey = Tuple[str, str, str]
+
+
+def shard_for(owner_name: str, num_shards: int) -> int:
+	"""Return the shard index that owns owner_name."""
+	return zlib.crc32(owner_name.encode("utf-8")) % num_shards
+
+
+class StaleColumnsError(RuntimeError):
+	"""Raised when reading columns from a block the shard has replaced."""
+
+
+def _block_size(capacity: int) -> int:
+	return (HEADER_ITEMS + capacity * len(COLUMNS)) * ITEM_SIZE
+
+
+def _header_view(buffer: memoryview) -> memoryview:
+	return buffer[: HEADER_ITEMS * ITEM_SIZE].cast("i")
+
+
+def _column_views(buffer: memoryview, capacity: int) -> List[memoryview]:
+	size = capacity * ITEM_SIZE
+	base = HEADER_ITEMS * ITEM_SIZE
+	return [
+		buffer[base + index * size : base + (index + 1) * size].cast("i")
+		for index in range(len(COLUMNS))
+	]
+
+
+class _Shard:
+	"""State held inside one worker process."""
+
+	def __init__(self, availability: Optional[int], availability_windows: Any) -> None:
+		self.scheduler = Scheduler(availability=availability, availability_windows=availability_windows)
+		self.owners: Dict[str, Owner] = {}
+		self.keys: List[TaskKey] = []
+		self.rows: Dict[TaskKey, int] = {}
+		self.capacity = 0
+		self.generation = 0
+		self.memory: Optional[SharedMemory] = None
+		self.header: Optional[memoryview] = None
+		self.columns: List[memoryview] = []
+		self._allocate(INITIAL_CAPACITY)
+
+	def _allocate(self, capacity: int) -> None:
+		memory = SharedMemory(create=True, size=_block_size(capacity))
+		header = _header_view(memory.buf)
+		columns = _column_views(memory.buf, capacity)
+		for new, old in zip(columns, self.columns):
+			new[: len(self.keys)] = old[: len(self.keys)]
+		self.close()
+		self.generation += 1
+		header[0] = self.generation
+		header[1] = 0
+		self.memory, self.header, self.columns, self.capacity = memory, header, columns, capacity
+
+	def close(self) -> None:
+		for column in self.columns:
+			column.release()
+		self.columns = []
+		if self.header is not None:
+			self.header[1] = RETIRED
+			self.header.release()
+			self.header = None
+		if self.memory is not None:
+			self.memory.close()
+			self.memory.unlink()
+			self.memory = None
+
+	def _pet(self, owner_name: str, pet_name: str) -> Pet:
+		owner = self.owners.get(owner_name)
+		if owner is None:
+			raise KeyError(f"unknown owner {owner_name!r}")
+		for pet in owner.owned_pets:
+			if pet.name == pet_name:
+				return pet
+		raise KeyError(f"owner {owner_name!r} has no pet {pet_name!r}")
+
+	def _task(self, owner_name: str, pet_name: str, task_name: str) -> Task:
+		task = self._pet(owner_name, pet_name).get_task(task_name)
+		if task is None:
+			raise KeyError(f"pet {pet_name!r} has no task {task_name!r}")
+		return task
+
+	def _write_row(self, key: TaskKey, task: Task) -> None:
+		row = self.rows.get(key)
+		if row is None:
+			if len(self.keys) == self.capacity:
+				self._allocate(self.capacity * 2)
+			row = len(self.keys)
+			self.rows[key] = row
+			self.keys.append(key)
+		values = (
+			task.duration,
+			task.priority,
+			NO_DUE_TIME if task.due_time is None else task.due_time,
+			STATUS_CODES.get(task.status, OTHER_CODE),
+			RECURRENCE_CODES.get(task.recurrence, OTHER_CODE),
+			0 if task.last_completed_date is None else task.last_completed_date.toordinal(),
+		)
+		for column, value in zip(self.columns, values):
+			column[row] = value
+
+	def add_owner(self, owner_name: str) -> None:
+		self.owners.setdefault(owner_name, Owner(owner_name))
+
+	def add_pet(self, owner_name: str, pet_name: str) -> None:
+		self.add_owner(owner_name)
+		owner = self.owners[owner_name]
+		if all(pet.name != pet_name for pet in owner.owned_pets):
+			owner.add_pet(Pet(pet_name))
+
+	def add_task(self, owner_name: str, pet_name: str, task: Task) -> None:
+		self._pet(owner_name, pet_name).add_task(task)
+		self._write_row((owner_name, pet_name, task.name), task)
+
+	def mark_completed(self, owner_name: str, pet_name: str, task_name: str, completed_on: Optional[date]) -> None:
+		task = self._task(owner_name, pet_name, task_name)
+		task.mark_completed(completed_on)
+		self._write_row((owner_name, pet_name, task_name), task)
+
+	def mark_in_progress(self, owner_name: str, pet_name: str, task_name: str) -> None:
+		task = self._task(owner_name, pet_name, task_name)
+		task.mark_in_progress()
+		self._write_row((owner_name, pet_name, task_name), task)
+
+	def generate_daily_plan(self, owner_name: str, kwargs: Dict[str, Any]) -> List[Tuple[str, Task]]:
+		owner = self.owners.get(owner_name)
+		if owner is None:
+			raise KeyError(f"unknown owner {owner_name!r}")
+		self.scheduler.pets = owner.owned_pets
+		return [(pet.name, task) for pet, task in self.scheduler.generate_daily_plan(**kwargs)]
+
+	def due_on(self, on_date: date) -> List[Tuple[str, str, Task]]:
+		due = [
+			(owner.name, pet.name, task)
+			for owner in self.owners.values()
+			for pet in owner.owned_pets
+			for task in pet.list_tasks()
+			if task.is_due(on_date)
+		]
+		due.sort(key=lambda item: (item[0], item[1], item[2].name))
+		return due
+
+	def layout(self) -> Tuple[str, int, int, int]:
+		assert self.memory is not None
+		return self.memory.name, self.generation, self.capacity, len(self.keys)
+
+	def row_keys(self, rows: int) -> List[TaskKey]:
+		return self.keys[:rows]
+
+
+def _shard_main(connection: Connection, availability: Optional[int], availability_windows: Any) -> None:
+	shard = _Shard(availability, availability_windows)
+	try:
+		while True:
+			command, args = connection.recv()
+			if command == "stop":
+				connection.send(("ok", None))
+				return
+			try:
+				connection.send(("ok", getattr(shard, command)(*args)))
+			except Exception as error:  # noqa: BLE001 - forwarded to the caller
+				connection.send(("error", error))
+	finally:
+		shard.close()
+		connection.close()
+
+
+class ShardColumns:
+	"""Zero-copy, read-only view of one shard's task columns.
+
+	Values of existing rows reflect the shard at the moment they are read;
+	row i describes keys[i] when keys were requested (otherwise keys is
+	None). Rows added later are not included, and once the
+	shard grows into a new block this view is stale: ``column`` then raises
+	``StaleColumnsError``. Call ``ShardedTaskStore.columns`` again in either
+	case.
+	"""
+
+	def __init__(
+		self,
+		name: str,
+		generation: int,
+		capacity: int,
+		rows: int,
+		keys: Optional[List[TaskKey]] = None,
+	) -> None:
+		"""Attach to the shard's shared memory block."""
+		self.name = name
+		self.generation = generation
+		self.rows = rows
+		self.keys = keys
+		self._memory = SharedMemory(name=name)
+		self._header = _header_view(self._memory.buf)
+		self._columns = _column_views(self._memory.buf, capacity)
+
+	@property
+	def stale(self) -> bool:
+		"""True once the shard has moved its columns to a newer block."""
+		return self._header[1] == RETIRED
+
+	def column(self, name: str) -> memoryview:
+		"""Return the int32 column called name, limited to live rows.
+
+		Release the returned view before the columns are closed.
+		"""
+		if self.stale:
+			raise StaleColumnsError(f"columns of generation {self.generation} were replaced; fetch them again")
+		return self._columns[COLUMNS.index(name)][: self.rows]
+
+	def close(self) -> None:
+		"""Detach from the shared memory block."""
+		for column in self._columns:
+			column.release()
+		self._columns = []
+		self._header.release()
+		self._memory.close()
+
+
+class ShardedTaskStore:
+	def __init__(
+		self,
+		num_shards: Optional[int] = None,
+		*,
+		availability: Optional[int] = None,
+		availability_windows: Optional[Union[WindowSpec, Mapping[date, WindowSpec]]] = None,
+		start_method: str = "spawn",
+	) -> None:
+		"""Start one worker process per shard."""
+		self.num_shards = num_shards or os.cpu_count() or 1
+		context = multiprocessing.get_context(start_method)
+		self._connections: List[Connection] = []
+		self._locks: List[threading.Lock] = []
+		self._processes = []
+		self._columns: Dict[int, ShardColumns] = {}
+		for _ in range(self.num_shards):
+			parent_end, child_end = context.Pipe()
+			process = context.Process(
+				target=_shard_main,
+				args=(child_end, availability, availability_windows),
+				daemon=True,
+			)
+			process.start()
+			child_end.close()
+			self._connections.append(parent_end)
+			self._locks.append(threading.Lock())
+			self._processes.append(process)
+
+	def __enter__(self) -> "ShardedTaskStore":
+		return self
+
+	def __exit__(self, *exc_info: object) -> None:
+		self.close()
+
+	def close(self) -> None:
+		"""Stop every worker and release shared memory."""
+		for columns in self._columns.values():
+			columns.close()
+		self._columns.clear()
+		for index, connection in enumerate(self._connections):
+			with self._locks[index]:
+				if connection.closed:
+					continue
+				try:
+					self._call_locked(index, "stop")
+				except (EOFError, OSError):
+					pass  # the worker already exited; keep stopping the others
+				finally:
+					connection.close()
+		for process in self._processes:
+			process.join(STOP_TIMEOUT)
+			if process.is_alive():
+				process.terminate()
+				process.join()
+
+	@staticmethod
+	def _unwrap(reply: Tuple[str, Any]) -> Any:
+		status, value = reply
+		if status == "error":
+			raise value
+		return value
+
+	def _call_locked(self, shard: int, command: str, *args: Any) -> Any:
+		connection = self._connections[shard]
+		connection.send((command, args))
+		return self._unwrap(connection.recv())
+
+	def _call(self, owner_name: str, command: str, *args: Any) -> Any:
+		shard = shard_for(owner_name, self.num_shards)
+		with self._locks[shard]:
+			return self._call_locked(shard, command, owner_name, *args)
+
+	def _fan_out(self, command: str, *args: Any) -> List[Any]:
+		# Locks are always taken in shard order, so concurrent fan-outs cannot deadlock.
+		for lock in self._locks:
+			lock.acquire()
+		try:
+			for connection in self._connections:
+				connection.send((command, args))
+			# Drain every reply before raising so no pipe is left holding a stale one.
+			replies = [connection.recv() for connection in self._connections]
+			return [self._unwrap(reply) for reply in replies]
+		finally:
+			for lock in self._locks:
+				lock.release()
+
+	def add_owner(self, owner_name: str) -> None:
+		"""Register an owner on its shard."""
+		self._call(owner_name, "add_owner")
+
+	def add_pet(self, owner_name: str, pet_name: str) -> None:
+		"""Add a pet (and its owner, if new) on the owner's shard."""
+		self._call(owner_name, "add_pet", pet_name)
+
+	def add_task(self, owner_name: str, pet_name: str, task: Task) -> None:
+		"""Add or replace a task for a pet on the owner's shard."""
+		self._call(owner_name, "add_task", pet_name, task)
+
+	def mark_completed(
+		self,
+		owner_name: str,
+		pet_name: str,
+		task_name: str,
+		completed_on: Optional[date] = None,
+	) -> None:
+		"""Mark a task completed on the owner's shard."""
+		self._call(owner_name, "mark_completed", pet_name, task_name, completed_on)
+
+	def mark_in_progress(self, owner_name: str, pet_name: str, task_name: str) -> None:
+		"""Mark a task in progress on the owner's shard."""
+		self._call(owner_name, "mark_in_progress", pet_name, task_name)
+
+	def generate_daily_plan(
+		self,
+		owner_name: str,
+		*,
+		pet_name: Optional[str] = None,
+		status: Optional[str] = None,
+		on_date: Optional[date] = None,
+	) -> List[Tuple[str, Task]]:
+		"""Generate an owner's plan on its shard as (pet name, task) pairs."""
+		kwargs = {"pet_name": pet_name, "status": status, "on_date": on_date}
+		return self._call(owner_name, "generate_daily_plan", kwargs)
+
+	def due_on(self, on_date: Optional[date] = None) -> List[Tuple[str, str, Task]]:
+		"""Return (owner, pet, task) for every task due on a date, across shards."""
+		per_shard = self._fan_out("due_on", on_date or date.today())
+		return list(heapq.merge(*per_shard, key=lambda item: (item[0], item[1], item[2].name)))
+
+	def columns(self, shard: int, *, with_keys: bool = False) -> ShardColumns:
+		"""Attach to a shard's current task columns.
+
+		Row keys are only sent over the pipe when with_keys is true.
+		"""
+		with self._locks[shard]:
+			name, generation, capacity, rows = self._call_locked(shard, "layout")
+			keys = self._call_locked(shard, "row_keys", rows) if with_keys else None
+		cached = self._columns.get(shard)
+		if cached is not None:
+			cached.close()
+		columns = ShardColumns(name, generation, capacity, rows, keys)
+		self._columns[shard] = columns
+		return columns
+
+	def count_by_status(self) -> Counter:
+		"""Count tasks per status code by reading shared columns in place."""
+		counts: Counter = Counter()
+		code_names = {code: status for status, code in STATUS_CODES.items()}
+		for shard in range(self.num_shards):
+			for code in self.columns(shard).column("status"):
+				counts[code_names.get(code, "other")] += 1
+		return counts
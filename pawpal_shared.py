@@ -0,0 +1,207 @@
+"""A Scheduler that many threads can share through copy-on-write versions.
+
+Readers grab the current ``StoreVersion`` (a single attribute read) and plan
+against it without locking. Writers take one lock, copy only the pet and task
+they change, and publish a new version. Pets and tasks reachable from a
+published version are read-only: assigning attributes or calling methods
+such as ``Pet.add_task`` or ``Task.mark_completed`` on them raises
+``TypeError``, so every change has to go through ``SharedScheduler``.
+Published pets have ``owner`` set to None; the store, not an ``Owner``,
+holds them.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, fields
+from datetime import date
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from pawpal_system import Pet, Scheduler, Task, WindowSpec
+
+READ_ONLY_MESSAGE = "published pets and tasks are read-only; change them through SharedScheduler"
+
+
+@dataclass(frozen=True)
+class StoreVersion:
+	version: int
+	pets: Tuple[Pet, ...]
+
+	def get_pet(self, pet_name: str) -> Optional[Pet]:
+		"""Return the pet with this name in this version, if any."""
+		for pet in self.pets:
+			if pet.name == pet_name:
+				return pet
+		return None
+
+
+class _ReadOnlyTask(Task):
+	def __setattr__(self, name: str, value: Any) -> None:
+		if self.__dict__.get("_sealed"):
+			raise TypeError(READ_ONLY_MESSAGE)
+		super().__setattr__(name, value)
+
+
+class _ReadOnlyPet(Pet):
+	def __setattr__(self, name: str, value: Any) -> None:
+		if self.__dict__.get("_sealed"):
+			raise TypeError(READ_ONLY_MESSAGE)
+		super().__setattr__(name, value)
+
+	def add_task(self, task: Task) -> None:
+		"""Reject changes to a published pet."""
+		raise TypeError(READ_ONLY_MESSAGE)
+
+	def remove_task(self, task_name: str) -> None:
+		"""Reject changes to a published pet."""
+		raise TypeError(READ_ONLY_MESSAGE)
+
+
+def _task_values(task: Task) -> Dict[str, Any]:
+	return {task_field.name: getattr(task, task_field.name) for task_field in fields(Task)}
+
+
+def _thaw_task(task: Task) -> Task:
+	return Task(**_task_values(task))
+
+
+def _freeze_task(task: Task) -> Task:
+	if isinstance(task, _ReadOnlyTask):
+		return task
+	frozen = _ReadOnlyTask(**_task_values(task))
+	object.__setattr__(frozen, "_sealed", True)
+	return frozen
+
+
+def _freeze_pet(name: str, tasks: Dict[str, Task]) -> Pet:
+	frozen = _ReadOnlyPet(
+		name=name,
+		current_tasks=MappingProxyType({task_name: _freeze_task(task) for task_name, task in tasks.items()}),
+	)
+	object.__setattr__(frozen, "_sealed", True)
+	return frozen
+
+
+class SharedScheduler:
+	def __init__(
+		self,
+		pets: Optional[Iterable[Pet]] = None,
+		availability: Optional[int] = None,
+		*,
+		availability_windows: Optional[Union[WindowSpec, Mapping[date, WindowSpec]]] = None,
+	) -> None:
+		"""Copy the given pets into the first published version."""
+		self._write_lock = threading.Lock()
+		self._template = Scheduler(availability=availability, availability_windows=availability_windows)
+		self._current = StoreVersion(0, tuple(_freeze_pet(pet.name, pet.current_tasks) for pet in pets or []))
+
+	@property
+	def current(self) -> StoreVersion:
+		"""Return the latest published version without locking."""
+		return self._current
+
+	@property
+	def version(self) -> int:
+		"""Return the number of the latest published version."""
+		return self._current.version
+
+	def scheduler(self, snapshot: Optional[StoreVersion] = None) -> Scheduler:
+		"""Return a private Scheduler bound to a version (latest by default)."""
+		snapshot = snapshot or self._current
+		scheduler = Scheduler(availability=self._template.availability, pets=list(snapshot.pets))
+		scheduler.availability_windows = self._template.availability_windows
+		return scheduler
+
+	def generate_daily_plan(
+		self,
+		*,
+		pet_name: Optional[str] = None,
+		status: Optional[str] = None,
+		on_date: Optional[date] = None,
+	) -> List[Tuple[Pet, Task]]:
+		"""Generate a plan from the latest version without locking."""
+		return self.plan_with_conflicts(pet_name=pet_name, status=status, on_date=on_date)[0]
+
+	def plan_with_conflicts(
+		self,
+		*,
+		pet_name: Optional[str] = None,
+		status: Optional[str] = None,
+		on_date: Optional[date] = None,
+	) -> Tuple[List[Tuple[Pet, Task]], List[Tuple[Pet, Task, Pet, Task]]]:
+		"""Generate a plan and its same-time conflicts from one version.
+
+		Returned together because a shared ``same_time_conflicts`` attribute
+		would be overwritten by concurrent readers.
+		"""
+		scheduler = self.scheduler()
+		plan = scheduler.generate_daily_plan(pet_name=pet_name, status=status, on_date=on_date)
+		return plan, scheduler.same_time_conflicts
+
+	def detect_conflicts(self, plan: Iterable[Tuple[Pet, Task]]) -> List[Tuple[Pet, Task, Pet, Task]]:
+		"""Detect overlap conflicts in a plan."""
+		return self._template.detect_conflicts(plan)
+
+	def add_pet(self, pet: Pet) -> StoreVersion:
+		"""Publish a version that includes a copy of pet."""
+		with self._write_lock:
+			current = self._current
+			if current.get_pet(pet.name) is not None:
+				raise ValueError(f"pet {pet.name!r} already exists")
+			return self._publish(current.pets + (_freeze_pet(pet.name, pet.current_tasks),))
+
+	def add_task(self, pet_name: str, task: Task) -> StoreVersion:
+		"""Publish a version where pet_name has a copy of task added or replaced."""
+
+		def add(tasks: Dict[str, Task]) -> None:
+			tasks[task.name] = task
+
+		return self._update_pet(pet_name, add)
+
+	def remove_task(self, pet_name: str, task_name: str) -> StoreVersion:
+		"""Publish a version without the named task."""
+		return self._update_pet(pet_name, lambda tasks: tasks.pop(task_name, None))
+
+	def mark_in_progress(self, pet_name: str, task_name: str) -> StoreVersion:
+		"""Publish a version where the named task is in progress."""
+		return self._update_task(pet_name, task_name, lambda task: task.mark_in_progress())
+
+	def mark_completed(
+		self,
+		pet_name: str,
+		task_name: str,
+		completed_on: Optional[date] = None,
+	) -> StoreVersion:
+		"""Publish a version where the named task is completed."""
+		return self._update_task(pet_name, task_name, lambda task: task.mark_completed(completed_on))
+
+	def _update_task(self, pet_name: str, task_name: str, mutate: Callable[[Task], None]) -> StoreVersion:
+		def update(tasks: Dict[str, Task]) -> None:
+			task = tasks.get(task_name)
+			if task is None:
+				raise KeyError(f"pet {pet_name!r} has no task {task_name!r}")
+			task = _thaw_task(task)
+			mutate(task)
+			tasks[task_name] = task
+
+		return self._update_pet(pet_name, update)
+
+	def _update_pet(self, pet_name: str, mutate: Callable[[Dict[str, Task]], object]) -> StoreVersion:
+		with self._write_lock:
+			current = self._current
+			for index, pet in enumerate(current.pets):
+				if pet.name == pet_name:
+					break
+			else:
+				raise KeyError(f"unknown pet {pet_name!r}")
+			# Shallow copy: untouched tasks stay shared with older versions.
+			tasks = dict(pet.current_tasks)
+			mutate(tasks)
+			new_pet = _freeze_pet(pet.name, tasks)
+			return self._publish(current.pets[:index] + (new_pet,) + current.pets[index + 1 :])
+
+	def _publish(self, pets: Tuple[Pet, ...]) -> StoreVersion:
+		published = StoreVersion(self._current.version + 1, pets)
+		self._current = published
+		return published
@@ -0,0 +1,372 @@
+"""Versioned binary snapshots of owners, pets and tasks.
+
+Layout (little-endian), version 1::
+
+	header        HEADER struct (magic, version, counts, section offsets)
+	owners        OWNER_RECORD * owner_count
+	pets          PET_RECORD * pet_count     (grouped by owner)
+	tasks         TASK_RECORD * task_count   (grouped by pet)
+	string index  u64 * (string_count + 1)   (byte offsets into string data)
+	string data   UTF-8 bytes
+
+Names, descriptions, statuses and recurrence labels are interned in the
+string table and referenced by id; ``NONE`` marks a missing value. Dates are
+stored as ``date.toordinal()`` with 0 meaning None. ``Snapshot`` maps the
+file and only builds ``Owner``/``Pet``/``Task`` objects for the records that
+are actually accessed.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from datetime import date
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from pawpal_system import Owner, Pet, Task
+
+MAGIC = b"PAWPSNAP"
+VERSION = 1
+NONE = 0xFFFFFFFF
+NO_DUE_TIME = -(2**31)
+
+HEADER = struct.Struct("<8sHHIIII5Q")
+OWNER_RECORD = struct.Struct("<III")  # name, first pet, pet count
+PET_RECORD = struct.Struct("<IIII")  # owner index, name, first task, task count
+TASK_RECORD = struct.Struct("<IIIiiIiIII")  # pet, name, description, duration, priority,
+# status, due time, recurrence, last completed ordinal, next due ordinal
+STRING_OFFSET = struct.Struct("<Q")
+
+PathOrStream = Union[str, BinaryIO]
+
+
+class _StringTable:
+	def __init__(self) -> None:
+		self.ids: Dict[str, int] = {}
+		self.encoded: List[bytes] = []
+
+	def intern(self, value: Optional[str]) -> int:
+		if value is None:
+			return NONE
+		string_id = self.ids.get(value)
+		if string_id is None:
+			string_id = len(self.encoded)
+			self.ids[value] = string_id
+			self.encoded.append(value.encode("utf-8"))
+		return string_id
+
+
+def _ordinal(value: Optional[date]) -> int:
+	return 0 if value is None else value.toordinal()
+
+
+def write_snapshot(
+	target: PathOrStream,
+	owners: Iterable[Owner],
+	pets: Iterable[Pet] = (),
+) -> None:
+	"""Write owners (and optional ownerless pets) to a binary snapshot."""
+	owner_list = list(owners)
+	pet_list: List[Tuple[int, Pet]] = []
+	for owner_index, owner in enumerate(owner_list):
+		pet_list.extend((owner_index, pet) for pet in owner.owned_pets)
+	pet_list.extend((NONE, pet) for pet in pets)
+
+	strings = _StringTable()
+	task_count = 0
+	for owner in owner_list:
+		strings.intern(owner.name)
+	for _, pet in pet_list:
+		strings.intern(pet.name)
+		for task in pet.current_tasks.values():
+			strings.intern(task.name)
+			strings.intern(task.description)
+			strings.intern(task.status)
+			strings.intern(task.recurrence)
+			task_count += 1
+
+	owners_offset = HEADER.size
+	pets_offset = owners_offset + OWNER_RECORD.size * len(owner_list)
+	tasks_offset = pets_offset + PET_RECORD.size * len(pet_list)
+	index_offset = tasks_offset + TASK_RECORD.size * task_count
+	data_offset = index_offset + STRING_OFFSET.size * (len(strings.encoded) + 1)
+
+	offsets = (owners_offset, pets_offset, tasks_offset, index_offset, data_offset)
+	if isinstance(target, str):
+		with open(target, "wb") as stream:
+			_write_sections(stream, strings, owner_list, pet_list, task_count, offsets)
+	else:
+		_write_sections(target, strings, owner_list, pet_list, task_count, offsets)
+
+
+def _write_sections(
+	stream: BinaryIO,
+	strings: _StringTable,
+	owner_list: List[Owner],
+	pet_list: List[Tuple[int, Pet]],
+	task_count: int,
+	offsets: Tuple[int, int, int, int, int],
+) -> None:
+	stream.write(
+		HEADER.pack(
+			MAGIC,
+			VERSION,
+			0,
+			len(owner_list),
+			len(pet_list),
+			task_count,
+			len(strings.encoded),
+			*offsets,
+		)
+	)
+
+	first_pet = 0
+	for owner in owner_list:
+		stream.write(OWNER_RECORD.pack(strings.intern(owner.name), first_pet, len(owner.owned_pets)))
+		first_pet += len(owner.owned_pets)
+
+	first_task = 0
+	for owner_index, pet in pet_list:
+		stream.write(PET_RECORD.pack(owner_index, strings.intern(pet.name), first_task, len(pet.current_tasks)))
+		first_task += len(pet.current_tasks)
+
+	for pet_index, (_, pet) in enumerate(pet_list):
+		for task in pet.current_tasks.values():
+			stream.write(
+				TASK_RECORD.pack(
+					pet_index,
+					strings.intern(task.name),
+					strings.intern(task.description),
+					task.duration,
+					task.priority,
+					strings.intern(task.status),
+					NO_DUE_TIME if task.due_time is None else task.due_time,
+					strings.intern(task.recurrence),
+					_ordinal(task.last_completed_date),
+					_ordinal(task.next_due_date),
+				)
+			)
+
+	position = 0
+	for encoded in strings.encoded:
+		stream.write(STRING_OFFSET.pack(position))
+		position += len(encoded)
+	stream.write(STRING_OFFSET.pack(position))
+	for encoded in strings.encoded:
+		stream.write(encoded)
+
+
+class _LazyTasks(Sequence[Task]):
+	def __init__(self, snapshot: "Snapshot") -> None:
+		self._snapshot = snapshot
+
+	def __len__(self) -> int:
+		return self._snapshot.task_count
+
+	@overload
+	def __getitem__(self, index: int) -> Task: ...
+
+	@overload
+	def __getitem__(self, index: slice) -> List[Task]: ...
+
+	def __getitem__(self, index: Union[int, slice]) -> Union[Task, List[Task]]:
+		if isinstance(index, slice):
+			return [self._snapshot.task(i) for i in range(*index.indices(len(self)))]
+		if index < 0:
+			index += len(self)
+		return self._snapshot.task(index)
+
+	def __iter__(self) -> Iterator[Task]:
+		for index in range(len(self)):
+			yield self._snapshot.task(index)
+
+
+class _SnapshotOwner(Owner):
+	def __init__(self, snapshot: "Snapshot", name: str, pet_indexes: range) -> None:
+		self.name = name
+		self._snapshot = snapshot
+		self._pet_indexes = pet_indexes
+		self._owned_pets: Optional[List[Pet]] = None
+
+	@property
+	def owned_pets(self) -> List[Pet]:  # type: ignore[override]
+		return self._load_pets()
+
+	def _load_pets(self) -> List[Pet]:
+		if self._owned_pets is None:
+			self._owned_pets = [self._snapshot.pet(index) for index in self._pet_indexes]
+		return self._owned_pets
+
+	@owned_pets.setter
+	def owned_pets(self, pets: List[Pet]) -> None:
+		self._owned_pets = pets
+
+
+class Snapshot:
+	"""Read-only, memory-mapped view of a snapshot file.
+
+	Records are decoded straight from the mapping. Task, pet and owner
+	objects are created on first access and cached, so memory grows with the
+	records touched rather than with the size of the file.
+	"""
+
+	def __init__(self, path: str) -> None:
+		"""Map the snapshot at path and validate its header."""
+		with open(path, "rb") as stream:
+			self._mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+		self._view = memoryview(self._mmap)
+		if len(self._view) < HEADER.size:
+			self.close()
+			raise ValueError("file is too small to be a PawPal snapshot")
+		(
+			magic,
+			version,
+			_,
+			self.owner_count,
+			self.pet_count,
+			self.task_count,
+			self.string_count,
+			self._owners_offset,
+			self._pets_offset,
+			self._tasks_offset,
+			self._index_offset,
+			self._data_offset,
+		) = HEADER.unpack_from(self._view, 0)
+		if magic != MAGIC:
+			self.close()
+			raise ValueError("not a PawPal snapshot")
+		if version != VERSION:
+			self.close()
+			raise ValueError(f"unsupported snapshot version {version}")
+		if not self._sections_fit():
+			self.close()
+			raise ValueError("snapshot header does not match the file size")
+		self._strings: Dict[int, str] = {}
+		self._tasks: Dict[int, Task] = {}
+		self._pets: Dict[int, Pet] = {}
+		self._owners: Dict[int, _SnapshotOwner] = {}
+		self.tasks: Sequence[Task] = _LazyTasks(self)
+
+	def _sections_fit(self) -> bool:
+		size = len(self._view)
+		sections = (
+			(self._owners_offset, OWNER_RECORD.size * self.owner_count),
+			(self._pets_offset, PET_RECORD.size * self.pet_count),
+			(self._tasks_offset, TASK_RECORD.size * self.task_count),
+			(self._index_offset, STRING_OFFSET.size * (self.string_count + 1)),
+		)
+		if any(offset + length > size for offset, length in sections) or self._data_offset > size:
+			return False
+		final_offset = self._index_offset + STRING_OFFSET.size * self.string_count
+		(data_size,) = STRING_OFFSET.unpack_from(self._view, final_offset)
+		return self._data_offset + data_size <= size
+
+	def __enter__(self) -> "Snapshot":
+		return self
+
+	def __exit__(self, *exc_info: object) -> None:
+		self.close()
+
+	def close(self) -> None:
+		"""Release the mapping; objects already built stay usable."""
+		self._view.release()
+		self._mmap.close()
+
+	def string(self, string_id: int) -> Optional[str]:
+		"""Decode an interned string by id."""
+		if string_id == NONE:
+			return None
+		cached = self._strings.get(string_id)
+		if cached is not None:
+			return cached
+		start_offset = self._index_offset + STRING_OFFSET.size * string_id
+		(start,) = STRING_OFFSET.unpack_from(self._view, start_offset)
+		(end,) = STRING_OFFSET.unpack_from(self._view, start_offset + STRING_OFFSET.size)
+		value = str(self._view[self._data_offset + start : self._data_offset + end], "utf-8")
+		self._strings[string_id] = value
+		return value
+
+	def _record(self, record: struct.Struct, offset: int, count: int, index: int) -> Tuple[int, ...]:
+		if not 0 <= index < count:
+			raise IndexError("snapshot record index out of range")
+		return record.unpack_from(self._view, offset + record.size * index)
+
+	def task_pet_index(self, index: int) -> int:
+		"""Return the index of the pet that owns task index."""
+		return self._record(TASK_RECORD, self._tasks_offset, self.task_count, index)[0]
+
+	def task(self, index: int) -> Task:
+		"""Return the Task stored at index, building it on first access."""
+		cached = self._tasks.get(index)
+		if cached is not None:
+			return cached
+		(
+			_,
+			name_id,
+			description_id,
+			duration,
+			priority,
+			status_id,
+			due_time,
+			recurrence_id,
+			last_completed,
+			next_due,
+		) = self._record(TASK_RECORD, self._tasks_offset, self.task_count, index)
+		task = Task(
+			name=self.string(name_id) or "",
+			description=self.string(description_id) or "",
+			duration=duration,
+			priority=priority,
+			status=self.string(status_id) or "",
+			due_time=None if due_time == NO_DUE_TIME else due_time,
+			recurrence=self.string(recurrence_id),
+			last_completed_date=date.fromordinal(last_completed) if last_completed else None,
+			next_due_date=date.fromordinal(next_due) if next_due else None,
+		)
+		self._tasks[index] = task
+		return task
+
+	def pet(self, index: int) -> Pet:
+		"""Return the Pet stored at index together with its tasks.
+
+		The pet's owner is linked but its other pets are only built once
+		``owner.owned_pets`` is read.
+		"""
+		cached = self._pets.get(index)
+		if cached is not None:
+			return cached
+		owner_index, name_id, first_task, task_count = self._record(
+			PET_RECORD, self._pets_offset, self.pet_count, index
+		)
+		pet = Pet(name=self.string(name_id) or "")
+		self._pets[index] = pet
+		for task_index in range(first_task, first_task + task_count):
+			pet.add_task(self.task(task_index))
+		if owner_index != NONE:
+			pet.owner = self._owner(owner_index)
+		return pet
+
+	def owner(self, index: int) -> Owner:
+		"""Return the Owner stored at index together with its pets."""
+		owner = self._owner(index)
+		owner._load_pets()
+		return owner
+
+	def _owner(self, index: int) -> "_SnapshotOwner":
+		cached = self._owners.get(index)
+		if cached is not None:
+			return cached
+		name_id, first_pet, pet_count = self._record(OWNER_RECORD, self._owners_offset, self.owner_count, index)
+		owner = _SnapshotOwner(self, self.string(name_id) or "", range(first_pet, first_pet + pet_count))
+		self._owners[index] = owner
+		return owner
+
+	def owners(self) -> Iterator[Owner]:
+		"""Iterate over every owner, building each on demand."""
+		for index in range(self.owner_count):
+			yield self.owner(index)
+
+	@property
+	def materialized_task_count(self) -> int:
+		"""Number of Task objects built so far."""
+		return len(self._tasks)
@@ -1,9 +1,14 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from datetime import date, timedelta
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+MINUTES_PER_DAY = 24 * 60
+
+WindowSpec = Iterable[Tuple[int, int]]
 
 
 def sort_by_time(tasks: Iterable["Task"]) -> List["Task"]:
@@ -76,6 +81,39 @@ class Pet:
 		return list(self.current_tasks.values())
 
 
+class AvailabilityWindows:
+	"""Sorted, non-overlapping time windows (minutes from midnight) for one day."""
+
+	def __init__(self, windows: WindowSpec) -> None:
+		"""Validate, sort and merge windows into a bisectable index."""
+		merged: List[Tuple[int, int]] = []
+		for start, end in sorted(windows):
+			if start < 0 or end > MINUTES_PER_DAY or end <= start:
+				raise ValueError("availability windows must satisfy 0 <= start < end <= 1440")
+			if merged and start <= merged[-1][1]:
+				merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+			else:
+				merged.append((start, end))
+		self.windows: List[Tuple[int, int]] = merged
+		self.total_minutes: int = sum(end - start for start, end in merged)
+		self.longest_window: int = max((end - start for start, end in merged), default=0)
+		self._starts: List[int] = [start for start, _ in merged]
+
+	def window_for(self, start: int, duration: int) -> Optional[Tuple[int, int]]:
+		"""Return the window containing [start, start + duration), if any."""
+		index = bisect_right(self._starts, start) - 1
+		if index < 0:
+			return None
+		window = self.windows[index]
+		if start + duration > window[1]:
+			return None
+		return window
+
+	def fits(self, start: int, duration: int) -> bool:
+		"""Return True if a task starting at start fits entirely in one window."""
+		return self.window_for(start, duration) is not None
+
+
 class Scheduler:
 	def __init__(
 		self,
@@ -83,14 +121,36 @@ class Scheduler:
 		pets: Optional[List[Pet]] = None,
 		*,
 		timeframe_availability: Optional[int] = None,
+		availability_windows: Optional[Union[WindowSpec, Mapping[date, WindowSpec]]] = None,
 	) -> None:
-		"""Initialize the scheduler with availability and pets."""
+		"""Initialize the scheduler with availability and pets.
+
+		availability_windows is either a list of (start, end) minute windows
+		used on every day, or a mapping of date to such a list. Dates missing
+		from the mapping have no availability. Timed tasks must fit inside a
+		single window; untimed tasks must be no longer than the longest one.
+		"""
 		if availability is None and timeframe_availability is not None:
 			availability = timeframe_availability
 		self.availability: Optional[int] = availability
+		self.availability_windows: Optional[
+			Union[AvailabilityWindows, Dict[date, AvailabilityWindows]]
+		] = None
+		if isinstance(availability_windows, Mapping):
+			self.availability_windows = {
+				day: AvailabilityWindows(windows) for day, windows in availability_windows.items()
+			}
+		elif availability_windows is not None:
+			self.availability_windows = AvailabilityWindows(availability_windows)
 		self.pets: List[Pet] = pets or []
 		self.same_time_conflicts: List[Tuple[Pet, Task, Pet, Task]] = []
 
+	def windows_for(self, on_date: date) -> Optional[AvailabilityWindows]:
+		"""Return the availability windows for a date, or None if unrestricted."""
+		if isinstance(self.availability_windows, dict):
+			return self.availability_windows.get(on_date) or AvailabilityWindows([])
+		return self.availability_windows
+
 	def generate_daily_plan(
 		self,
 		*,
@@ -99,8 +159,13 @@ class Scheduler:
 		on_date: Optional[date] = None,
 	) -> List[Tuple[Pet, "Task"]]:
 		"""Generate an ordered plan of due tasks within availability."""
+		target_date = on_date or date.today()
 		available_minutes = self.availability if isinstance(self.availability, int) else None
-		plan_candidates = self._collect_tasks(pet_name=pet_name, status=status, on_date=on_date)
+		windows = self.windows_for(target_date)
+		if windows is not None:
+			if available_minutes is None or windows.total_minutes < available_minutes:
+				available_minutes = windows.total_minutes
+		plan_candidates = self._collect_tasks(pet_name=pet_name, status=status, on_date=target_date)
 
 		plan_candidates.sort(
 			key=lambda item: (
@@ -120,6 +185,13 @@ class Scheduler:
 		for pet, task in plan_candidates:
 			if used_minutes + task.duration > available_minutes:
 				continue
+			if windows is not None:
+				# Untimed tasks can go anywhere but still need one window long enough.
+				if task.due_time is None:
+					if task.duration > windows.longest_window:
+						continue
+				elif not windows.fits(task.due_time, task.duration):
+					continue
 			plan.append((pet, task))
 			used_minutes += task.duration
 
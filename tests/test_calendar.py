@@ -0,0 +1,65 @@
+import random
+from datetime import date, timedelta
+
+from pawpal_calendar import ALWAYS, DueCalendar
+from pawpal_differential import random_case
+from pawpal_system import Pet, Task
+
+
+def test_due_on_matches_is_due() -> None:
+	for seed in range(200):
+		# Arrange
+		case = random_case(random.Random(seed))
+		pets = case.build_pets()
+		calendar = DueCalendar.from_pets(pets)
+
+		for offset in range(-1, 9):
+			on_date = case.on_date + timedelta(days=offset)
+
+			# Act
+			due = {id(task) for _, task in calendar.due_on(on_date)}
+
+			# Assert
+			expected = {id(task) for pet in pets for task in pet.list_tasks() if task.is_due(on_date)}
+			assert due == expected, (case, on_date)
+
+
+def test_mark_completed_moves_task_between_buckets() -> None:
+	# Arrange
+	today = date(2024, 5, 1)
+	pet = Pet("Milo")
+	walk = Task("Walk", "", 30, 2, Task.STATUS_PENDING, recurrence="weekly")
+	bath = Task("Bath", "", 20, 1, Task.STATUS_PENDING)
+	pet.add_task(walk)
+	pet.add_task(bath)
+	calendar = DueCalendar.from_pets([pet])
+
+	# Act
+	calendar.mark_completed(pet, walk, today)
+	calendar.mark_completed(pet, bath, today)
+
+	# Assert
+	assert calendar.next_due_date(walk) == today + timedelta(days=7)
+	assert calendar.next_due_date(bath) is None
+	assert calendar.due_on(today + timedelta(days=6)) == []
+	assert calendar.due_on(today + timedelta(days=7)) == [(pet, walk)]
+
+
+def test_due_between_reports_first_due_day_in_range() -> None:
+	# Arrange
+	start = date(2024, 5, 1)
+	pet = Pet("Luna")
+	meds = Task("Meds", "", 5, 3, Task.STATUS_PENDING, recurrence="daily", last_completed_date=start + timedelta(days=2))
+	brush = Task("Brush", "", 10, 1, Task.STATUS_PENDING)
+	pet.add_task(meds)
+	pet.add_task(brush)
+	calendar = DueCalendar.from_pets([pet])
+
+	# Act
+	window = calendar.due_between(start, start + timedelta(days=5))
+	early = calendar.due_between(start, start + timedelta(days=1))
+
+	# Assert
+	assert calendar.next_due_date(brush) == ALWAYS
+	assert window == [(start, pet, brush), (start + timedelta(days=3), pet, meds)]
+	assert early == [(start, pet, brush)]
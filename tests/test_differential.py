@@ -0,0 +1,76 @@
+import pytest
+
+from pawpal_differential import (
+	ENGINE_PAIRS,
+	Case,
+	TaskSpec,
+	assert_matches_oracle,
+	find_counterexample,
+	oracle_plan,
+	shrink,
+)
+from pawpal_reference import reference_collect_tasks, reference_detect_same_time_conflicts
+from pawpal_system import Task
+
+
+@pytest.mark.parametrize("engine_name", sorted(ENGINE_PAIRS))
+def test_engine_matches_oracle(engine_name: str) -> None:
+	oracle, candidate = ENGINE_PAIRS[engine_name]
+	assert_matches_oracle(oracle, candidate, seeds=range(300))
+
+
+def test_broken_engine_is_shrunk_to_minimal_case() -> None:
+	# Arrange: an engine that forgets the priority tie-break
+	def broken_plan(case: Case) -> object:
+		candidates = reference_collect_tasks(
+			case.build_pets(),
+			pet_name=case.pet_name,
+			status=case.status,
+			on_date=case.on_date,
+		)
+		candidates.sort(
+			key=lambda item: (
+				item[1].due_time is None,
+				item[1].due_time if item[1].due_time is not None else 0,
+				item[1].duration,
+			)
+		)
+		plan = []
+		used_minutes = 0
+		for pet, task in candidates:
+			if case.availability is not None and used_minutes + task.duration > case.availability:
+				continue
+			plan.append((pet, task))
+			used_minutes += task.duration
+		same_time = reference_detect_same_time_conflicts(plan)
+		return (
+			tuple((pet.name, task.name) for pet, task in plan),
+			tuple((a.name, x.name, b.name, y.name) for a, x, b, y in same_time),
+		)
+
+	# Act
+	counterexample = find_counterexample(oracle_plan, broken_plan, seeds=range(300))
+
+	# Assert
+	assert counterexample is not None
+	case, expected, actual = counterexample
+	assert expected != actual
+	specs = [spec for _, pet_specs in case.pets for spec in pet_specs]
+	assert len(specs) == 2
+	assert specs[0].priority != specs[1].priority
+
+
+def test_shrink_keeps_failing_property() -> None:
+	# Arrange
+	specs = tuple(
+		TaskSpec(name=f"t{index}", duration=10, priority=1, status=Task.STATUS_PENDING, due_time=480)
+		for index in range(5)
+	)
+	case = Case(pets=(("a", specs), ("b", specs)), availability=60)
+
+	# Act
+	minimal = shrink(case, lambda c: any(spec.due_time == 480 for _, s in c.pets for spec in s))
+
+	# Assert
+	assert minimal.availability is None
+	assert [len(s) for _, s in minimal.pets] == [1]
@@ -0,0 +1,99 @@
+import csv
+import io
+from datetime import date, datetime, timedelta, timezone
+
+from pawpal_export import iter_plans, write_csv, write_ics
+from pawpal_system import Owner, Pet, Task
+
+
+def build_owner() -> Owner:
+	owner = Owner("Jordan")
+	pet = Pet("Milo")
+	owner.add_pet(pet)
+	pet.add_task(Task("Walk", "Morning walk, long", 30, 2, Task.STATUS_PENDING, due_time=450, recurrence="daily"))
+	pet.add_task(Task("Vet", "Checkup", 60, 3, Task.STATUS_PENDING, due_time=600))
+	pet.add_task(Task("Brush", "", 10, 1, Task.STATUS_PENDING))
+	return owner
+
+
+def test_write_ics_emits_rrule_once_per_recurring_task() -> None:
+	# Arrange
+	start = date(2024, 5, 1)
+	plans = iter_plans([build_owner()], [start, start + timedelta(days=1)])
+	stream = io.StringIO(newline="")
+
+	# Act
+	count = write_ics(
+		stream,
+		plans,
+		until=start + timedelta(days=1),
+		stamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+	)
+
+	# Assert
+	text = stream.getvalue()
+	assert count == 5
+	assert text.startswith("BEGIN:VCALENDAR\r\n")
+	assert text.endswith("END:VCALENDAR\r\n")
+	assert text.count("RRULE:FREQ=DAILY") == 1
+	assert "RRULE:FREQ=DAILY;UNTIL=20240502T235959" in text
+	assert "DTSTART:20240501T073000\r\nDURATION:PT30M" in text
+	assert "DTSTART;VALUE=DATE:20240502" in text
+	assert "DESCRIPTION:Morning walk\\, long" in text
+
+
+def _uids(stream: io.StringIO) -> list:
+	return [line for line in stream.getvalue().split("\r\n") if line.startswith("UID:")]
+
+
+def test_write_ics_uids_use_owner_key() -> None:
+	# Arrange
+	first, second = build_owner(), build_owner()
+	keys = {first: "household-1", second: "household-2"}
+	forward = io.StringIO(newline="")
+	reversed_order = io.StringIO(newline="")
+
+	# Act
+	count = write_ics(forward, iter_plans([first, second], [date(2024, 5, 1)]), owner_key=keys.__getitem__)
+	write_ics(reversed_order, iter_plans([second, first], [date(2024, 5, 1)]), owner_key=keys.__getitem__)
+
+	# Assert
+	assert count == 6
+	assert len(set(_uids(forward))) == 6
+	assert _uids(forward)[:3] == _uids(reversed_order)[3:]
+
+
+def test_write_ics_folds_long_lines() -> None:
+	# Arrange
+	owner = Owner("Jordan")
+	pet = Pet("Milo")
+	owner.add_pet(pet)
+	pet.add_task(Task("Walk", "é" * 100, 30, 2, Task.STATUS_PENDING, due_time=450))
+	stream = io.StringIO(newline="")
+
+	# Act
+	write_ics(stream, iter_plans([owner], [date(2024, 5, 1)]))
+
+	# Assert
+	for line in stream.getvalue().split("\r\n"):
+		assert len(line.encode("utf-8")) <= 75
+
+
+def test_write_csv_streams_rows_for_many_owners() -> None:
+	# Arrange
+	owners = [build_owner(), build_owner()]
+	owners[1].name = "Sam"
+	dates = [date(2024, 5, 1), date(2024, 5, 2)]
+	stream = io.StringIO(newline="")
+
+	# Act
+	count = write_csv(stream, iter_plans(owners, dates))
+
+	# Assert
+	rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+	assert count == len(rows) == 10
+	walks = [row for row in rows if row["task"] == "Walk"]
+	assert [(row["owner"], row["rrule"], row["start"]) for row in walks] == [
+		("Jordan", "FREQ=DAILY", "07:30"),
+		("Sam", "FREQ=DAILY", "07:30"),
+	]
@@ -0,0 +1,80 @@
+import tracemalloc
+
+import pytest
+
+from pawpal_loadtest import RerunSample, _replay, format_report, summarize, synthetic_session_state
+
+
+class _Button:
+	label = "Generate schedule"
+
+	def click(self) -> None:
+		pass
+
+
+class _TimingOutApp:
+	def __init__(self) -> None:
+		self.session_state = {}
+		self.button = [_Button()]
+		self.exception = []
+		self.runs = 0
+
+	@classmethod
+	def from_file(cls, path: str, default_timeout: float) -> "_TimingOutApp":
+		return cls()
+
+	def run(self) -> None:
+		self.runs += 1
+		if self.runs > 1:
+			raise RuntimeError("AppTest script run timed out")
+
+
+def test_synthetic_session_state_matches_app_keys() -> None:
+	# Act
+	state = synthetic_session_state(pets=3, tasks_per_pet=4)
+
+	# Assert
+	assert set(state) == {"owner", "scheduler", "pets", "tasks"}
+	assert len(state["owner"].owned_pets) == 3
+	assert len(state["owner"].get_all_tasks()) == 12
+	assert len(state["tasks"]) == 12
+	assert state["scheduler"].pets == list(state["pets"].values())
+
+
+def test_summarize_reports_scaling_against_smallest_size() -> None:
+	# Arrange
+	samples = [
+		RerunSample("generate_schedule", 10, 10, 0.010, 1024),
+		RerunSample("generate_schedule", 10, 10, 0.030, 2048),
+		RerunSample("generate_schedule", 100, 10, 0.080, 4096),
+	]
+
+	# Act
+	rows = summarize(samples)
+
+	# Assert
+	assert [row["tasks"] for row in rows] == [100, 1000]
+	assert rows[0]["median_ms"] == pytest.approx(20.0)
+	assert rows[1]["vs_smallest"] == pytest.approx(4.0)
+	assert "generate_schedule" in format_report(rows)
+
+
+def test_traced_replay_stops_tracemalloc_when_rerun_fails() -> None:
+	# Act
+	with pytest.raises(RuntimeError):
+		_replay(_TimingOutApp, "app.py", {}, ["generate_schedule"], 1.0, traced=True)
+
+	# Assert
+	assert tracemalloc.is_tracing() is False
+
+
+def test_measure_drives_app_reruns() -> None:
+	pytest.importorskip("streamlit.testing.v1")
+	from pawpal_loadtest import measure
+
+	# Act
+	samples = measure(2, 3, repeats=1)
+
+	# Assert
+	assert [sample.interaction for sample in samples] == ["add_pet", "add_task", "generate_schedule"]
+	assert all(sample.seconds > 0 for sample in samples)
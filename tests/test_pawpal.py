@@ -1,6 +1,13 @@
 from datetime import date, timedelta
 
-from pawpal_system import Owner, Pet, Scheduler, Task, sort_by_time
+from pawpal_system import (
+	AvailabilityWindows,
+	Owner,
+	Pet,
+	Scheduler,
+	Task,
+	sort_by_time,
+)
 
 
 def test_task_completion_marks_completed() -> None:
@@ -264,4 +271,125 @@ def test_same_time_conflicts_detected_in_plan() -> None:
 
 	# Assert
 	assert len(plan) == 2
-	assert len(conflicts) == 1
\ No newline at end of file
+	assert len(conflicts) == 1
+
+
+def test_availability_windows_merge_and_fit() -> None:
+	# Arrange
+	windows = AvailabilityWindows([(600, 660), (420, 480), (470, 500)])
+
+	# Act / Assert
+	assert windows.windows == [(420, 500), (600, 660)]
+	assert windows.total_minutes == 140
+	assert windows.longest_window == 80
+	assert windows.fits(480, 20) is True
+	assert windows.fits(490, 20) is False
+	assert windows.fits(300, 10) is False
+
+
+def test_availability_windows_reject_invalid_window() -> None:
+	# Act / Assert
+	try:
+		AvailabilityWindows([(500, 400)])
+		assert False, "Expected ValueError for an inverted window"
+	except ValueError:
+		assert True
+
+
+def test_generate_daily_plan_skips_tasks_outside_windows() -> None:
+	# Arrange
+	pet = Pet(name="Milo")
+	pet.add_task(
+		Task(
+			name="Walk",
+			description="Morning walk",
+			duration=30,
+			priority=2,
+			status=Task.STATUS_PENDING,
+			due_time=450,
+		)
+	)
+	pet.add_task(
+		Task(
+			name="Lunch",
+			description="Feed",
+			duration=10,
+			priority=3,
+			status=Task.STATUS_PENDING,
+			due_time=720,
+		)
+	)
+	pet.add_task(
+		Task(
+			name="Brush",
+			description="Anytime",
+			duration=15,
+			priority=1,
+			status=Task.STATUS_PENDING,
+		)
+	)
+	scheduler = Scheduler(availability_windows=[(420, 500)], pets=[pet])
+
+	# Act
+	plan = scheduler.generate_daily_plan()
+
+	# Assert
+	assert [task.name for _, task in plan] == ["Walk", "Brush"]
+
+
+def test_generate_daily_plan_skips_untimed_tasks_longer_than_any_window() -> None:
+	# Arrange
+	pet = Pet(name="Milo")
+	pet.add_task(
+		Task(
+			name="Groom",
+			description="Anytime",
+			duration=35,
+			priority=3,
+			status=Task.STATUS_PENDING,
+		)
+	)
+	pet.add_task(
+		Task(
+			name="Brush",
+			description="Anytime",
+			duration=30,
+			priority=1,
+			status=Task.STATUS_PENDING,
+		)
+	)
+	scheduler = Scheduler(availability_windows=[(420, 430), (600, 630)], pets=[pet])
+
+	# Act
+	plan = scheduler.generate_daily_plan()
+
+	# Assert
+	assert [task.name for _, task in plan] == ["Brush"]
+
+
+def test_generate_daily_plan_uses_per_date_windows() -> None:
+	# Arrange
+	today = date.today()
+	pet = Pet(name="Luna")
+	pet.add_task(
+		Task(
+			name="Dinner",
+			description="Feed",
+			duration=10,
+			priority=2,
+			status=Task.STATUS_PENDING,
+			due_time=1080,
+		)
+	)
+	scheduler = Scheduler(
+		availability_windows={today: [(1020, 1140)]},
+		pets=[pet],
+	)
+
+	# Act
+	plan_today = scheduler.generate_daily_plan(on_date=today)
+	plan_tomorrow = scheduler.generate_daily_plan(on_date=today + timedelta(days=1))
+
+	# Assert
+	assert len(plan_today) == 1
+	assert plan_tomorrow == []
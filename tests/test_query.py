@@ -0,0 +1,79 @@
+import random
+
+from pawpal_differential import random_case
+from pawpal_query import FULL_SCAN, TaskIndex, TaskQuery
+from pawpal_system import Pet, Task, filter_tasks_by_status
+
+
+def build_pets() -> list:
+	milo = Pet("Milo")
+	luna = Pet("Luna")
+	milo.add_task(Task("Walk", "", 30, 2, Task.STATUS_PENDING, due_time=450, recurrence="daily"))
+	milo.add_task(Task("Meds", "", 5, 3, Task.STATUS_IN_PROGRESS, due_time=480))
+	milo.add_task(Task("Brush", "", 15, 1, Task.STATUS_PENDING))
+	luna.add_task(Task("Play", "", 20, 1, Task.STATUS_COMPLETED, due_time=1080, recurrence="weekly"))
+	luna.add_task(Task("Dinner", "", 10, 3, Task.STATUS_PENDING, due_time=1050))
+	return [milo, luna]
+
+
+def test_query_combines_criteria() -> None:
+	# Arrange
+	index = TaskIndex.from_pets(build_pets())
+	query = TaskQuery(
+		statuses={Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS},
+		min_priority=2,
+		due_window=(420, 1060),
+	).compile()
+
+	# Act
+	result = query.run(index)
+
+	# Assert
+	assert [task.name for _, task in result.pairs] == ["Walk", "Meds", "Dinner"]
+
+
+def test_query_treats_bare_string_as_one_value() -> None:
+	# Arrange
+	index = TaskIndex.from_pets(build_pets())
+
+	# Act
+	result = TaskQuery(statuses=Task.STATUS_PENDING, pet_names="Luna").compile().run(index)
+
+	# Assert
+	assert TaskQuery(statuses="pending").statuses == frozenset({"pending"})
+	assert [task.name for _, task in result.pairs] == ["Dinner"]
+
+
+def test_query_reports_most_selective_index() -> None:
+	# Arrange
+	index = TaskIndex.from_pets(build_pets())
+
+	# Act
+	by_due = TaskQuery(statuses={Task.STATUS_PENDING}, due_window=(1000, 1100)).compile().run(index)
+	by_recurrence = TaskQuery(recurrences={"weekly"}).compile().run(index)
+	scan = TaskQuery(max_duration=10).compile().run(index)
+
+	# Assert
+	assert by_due.index_used == "due_time"
+	assert by_due.candidates_scanned == 2
+	assert [task.name for _, task in by_due.pairs] == ["Dinner"]
+	assert by_recurrence.index_used == "recurrence"
+	assert scan.index_used == FULL_SCAN
+	assert [task.name for _, task in scan.pairs] == ["Meds", "Dinner"]
+
+
+def test_query_matches_filter_tasks_by_status() -> None:
+	for seed in range(200):
+		# Arrange
+		case = random_case(random.Random(seed))
+		pairs = [(pet, task) for pet in case.build_pets() for task in pet.list_tasks()]
+		index = TaskIndex.from_pairs(pairs)
+		statuses = None if case.status is None else {case.status}
+		pet_names = None if case.pet_name is None else {case.pet_name}
+
+		# Act
+		result = TaskQuery(statuses=statuses, pet_names=pet_names).compile().run(index)
+		expected = filter_tasks_by_status(tasks=pairs, status=case.status, pet_name=case.pet_name)
+
+		# Assert
+		assert result.pairs == expected, case
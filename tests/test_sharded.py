@@ -0,0 +1,157 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from pawpal_differential import oracle_plan, random_case
+from pawpal_reference import reference_is_due
+from pawpal_sharded import INITIAL_CAPACITY, ShardedTaskStore, StaleColumnsError, shard_for
+from pawpal_system import Task
+
+
+@pytest.fixture
+def store():
+	with ShardedTaskStore(num_shards=2, availability=120) as sharded:
+		for owner_index in range(6):
+			owner_name = f"owner-{owner_index}"
+			sharded.add_pet(owner_name, "Milo")
+			sharded.add_task(owner_name, "Milo", Task("Walk", "", 30, 2, Task.STATUS_PENDING, due_time=450, recurrence="daily"))
+			sharded.add_task(owner_name, "Milo", Task("Meds", "", 5, 3, Task.STATUS_PENDING, due_time=480))
+		yield sharded
+
+
+def test_owners_are_partitioned_across_shards() -> None:
+	shards = {shard_for(f"owner-{index}", 2) for index in range(6)}
+	assert shards == {0, 1}
+
+
+def test_plan_and_mutations_route_to_owning_shard(store) -> None:
+	# Arrange
+	today = date(2024, 5, 1)
+
+	# Act
+	store.mark_completed("owner-0", "Milo", "Walk", today)
+	plan_today = store.generate_daily_plan("owner-0", on_date=today)
+	plan_tomorrow = store.generate_daily_plan("owner-0", on_date=today + timedelta(days=1))
+
+	# Assert
+	assert [(pet, task.name) for pet, task in plan_today] == [("Milo", "Meds")]
+	assert [task.name for _, task in plan_tomorrow] == ["Walk", "Meds"]
+	with pytest.raises(KeyError):
+		store.generate_daily_plan("nobody")
+
+
+def test_due_on_fans_out_and_merges(store) -> None:
+	# Arrange
+	today = date(2024, 5, 1)
+	store.mark_completed("owner-0", "Milo", "Walk", today)
+
+	# Act
+	due = store.due_on(today)
+
+	# Assert
+	keys = [(owner, pet, task.name) for owner, pet, task in due]
+	assert keys == sorted(keys)
+	assert len(keys) == 11
+	assert ("owner-0", "Milo", "Walk") not in keys
+
+
+def test_columns_are_readable_from_shared_memory(store) -> None:
+	# Act
+	store.mark_in_progress("owner-1", "Milo", "Meds")
+	shard = shard_for("owner-1", 2)
+	columns = store.columns(shard, with_keys=True)
+	row = columns.keys.index(("owner-1", "Milo", "Meds"))
+
+	# Assert
+	assert columns.column("duration")[row] == 5
+	assert columns.column("due_time")[row] == 480
+	assert columns.column("status")[row] == 1
+	assert sum(store.count_by_status().values()) == 12
+	assert store.columns(shard).keys is None
+
+
+def test_failed_fan_out_leaves_pipes_in_sync(store) -> None:
+	# Arrange: only shard 0 has a completed daily task to compare dates with
+	owners = [f"owner-{index}" for index in range(6)]
+	failing = next(owner for owner in owners if shard_for(owner, 2) == 0)
+	healthy = next(owner for owner in owners if shard_for(owner, 2) == 1)
+	store.mark_completed(failing, "Milo", "Walk", date(2024, 5, 1))
+
+	# Act
+	with pytest.raises(TypeError):
+		store.due_on("not-a-date")
+	plan = store.generate_daily_plan(healthy, on_date=date(2024, 5, 1))
+
+	# Assert
+	assert [(pet, task.name) for pet, task in plan] == [("Milo", "Walk"), ("Milo", "Meds")]
+
+
+def test_sharded_store_matches_oracle() -> None:
+	# Arrange: one store per availability, one owner per random case
+	rng = random.Random(0)
+	cases = [random_case(rng) for _ in range(60)]
+	by_availability = {}
+	for index, case in enumerate(cases):
+		by_availability.setdefault(case.availability, []).append((f"owner-{index}", case))
+
+	for availability, owned_cases in by_availability.items():
+		with ShardedTaskStore(num_shards=2, availability=availability) as sharded:
+			for owner_name, case in owned_cases:
+				for pet in case.build_pets():
+					sharded.add_pet(owner_name, pet.name)
+					for task in pet.list_tasks():
+						sharded.add_task(owner_name, pet.name, task)
+
+			# Act / Assert
+			for owner_name, case in owned_cases:
+				plan = sharded.generate_daily_plan(
+					owner_name,
+					pet_name=case.pet_name,
+					status=case.status,
+					on_date=case.on_date,
+				)
+				assert tuple((pet, task.name) for pet, task in plan) == oracle_plan(case)[0]
+			on_date = owned_cases[0][1].on_date
+			expected = sorted(
+				(owner_name, pet.name, task.name)
+				for owner_name, case in owned_cases
+				for pet in case.build_pets()
+				for task in pet.list_tasks()
+				if reference_is_due(task, on_date)
+			)
+			assert [(owner, pet, task.name) for owner, pet, task in sharded.due_on(on_date)] == expected
+
+
+def test_columns_detect_replaced_block() -> None:
+	with ShardedTaskStore(num_shards=1) as sharded:
+		# Arrange
+		sharded.add_pet("owner-0", "Milo")
+		sharded.add_task("owner-0", "Milo", Task("Walk", "", 30, 2, Task.STATUS_PENDING))
+		columns = sharded.columns(0)
+		assert columns.stale is False
+
+		# Act
+		for index in range(INITIAL_CAPACITY):
+			sharded.add_task("owner-0", "Milo", Task(f"task-{index}", "", 5, 1, Task.STATUS_PENDING))
+
+		# Assert
+		assert columns.stale is True
+		with pytest.raises(StaleColumnsError):
+			columns.column("duration")
+		fresh = sharded.columns(0)
+		assert fresh.generation == columns.generation + 1
+		assert fresh.rows == INITIAL_CAPACITY + 1
+
+
+def test_close_stops_remaining_workers_after_one_died() -> None:
+	# Arrange
+	sharded = ShardedTaskStore(num_shards=3)
+	sharded._processes[0].kill()
+	sharded._processes[0].join()
+
+	# Act
+	sharded.close()
+
+	# Assert
+	assert all(not process.is_alive() for process in sharded._processes)
@@ -0,0 +1,116 @@
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from pawpal_shared import SharedScheduler
+from pawpal_system import Owner, Pet, Task
+
+
+def make_task(name: str, due_time: int = 480, recurrence: str = None) -> Task:
+	return Task(
+		name=name,
+		description="",
+		duration=10,
+		priority=1,
+		status=Task.STATUS_PENDING,
+		due_time=due_time,
+		recurrence=recurrence,
+	)
+
+
+def test_writes_publish_new_versions_without_touching_old_ones() -> None:
+	# Arrange
+	shared = SharedScheduler(pets=[Pet("Milo")])
+	shared.add_task("Milo", make_task("Walk", recurrence="daily"))
+	before = shared.current
+
+	# Act
+	today = date.today()
+	after = shared.mark_completed("Milo", "Walk", today)
+
+	# Assert
+	assert after.version == before.version + 1
+	assert before.get_pet("Milo").get_task("Walk").last_completed_date is None
+	assert after.get_pet("Milo").get_task("Walk").last_completed_date == today
+	assert shared.generate_daily_plan(on_date=today) == []
+	assert len(shared.generate_daily_plan(on_date=today + timedelta(days=1))) == 1
+
+
+def test_published_objects_reject_mutation() -> None:
+	# Arrange
+	owner = Owner("Jordan")
+	pet = Pet("Milo")
+	owner.add_pet(pet)
+	shared = SharedScheduler(pets=[pet])
+	shared.add_task("Milo", make_task("Walk"))
+	published = shared.current.get_pet("Milo")
+
+	# Act / Assert
+	with pytest.raises(TypeError):
+		published.add_task(make_task("Play"))
+	with pytest.raises(TypeError):
+		published.get_task("Walk").mark_completed()
+	with pytest.raises(TypeError):
+		published.name = "Luna"
+	assert published.owner is None
+	assert owner.owned_pets == [pet]
+	assert shared.current.get_pet("Milo").get_task("Walk").status == Task.STATUS_PENDING
+
+
+def test_unknown_pet_or_task_raises() -> None:
+	# Arrange
+	shared = SharedScheduler(pets=[Pet("Milo")])
+
+	# Act / Assert
+	with pytest.raises(KeyError):
+		shared.add_task("Luna", make_task("Walk"))
+	with pytest.raises(KeyError):
+		shared.mark_completed("Milo", "Walk")
+	with pytest.raises(ValueError):
+		shared.add_pet(Pet("Milo"))
+
+
+def test_plan_with_conflicts_reports_same_time_tasks() -> None:
+	# Arrange
+	shared = SharedScheduler(pets=[Pet("Milo"), Pet("Luna")])
+	shared.add_task("Milo", make_task("Walk"))
+	shared.add_task("Luna", make_task("Meds"))
+
+	# Act
+	plan, conflicts = shared.plan_with_conflicts()
+
+	# Assert
+	assert len(plan) == 2
+	assert [(first.name, second.name) for first, _, second, _ in conflicts] == [("Milo", "Luna")]
+
+
+def test_concurrent_writers_and_readers() -> None:
+	# Arrange
+	shared = SharedScheduler(pets=[Pet(f"pet-{index}") for index in range(4)])
+	errors = []
+
+	def writer(pet_name: str) -> None:
+		for index in range(200):
+			shared.add_task(pet_name, make_task(f"task-{index}", due_time=index))
+
+	def reader() -> None:
+		for _ in range(200):
+			snapshot = shared.current
+			plan = shared.scheduler(snapshot).generate_daily_plan()
+			if len(plan) != sum(len(pet.current_tasks) for pet in snapshot.pets):
+				errors.append(snapshot.version)
+
+	threads = [threading.Thread(target=writer, args=(f"pet-{index}",)) for index in range(4)]
+	threads += [threading.Thread(target=reader) for _ in range(4)]
+
+	# Act
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	# Assert
+	assert errors == []
+	assert shared.version == 800
+	assert len(shared.generate_daily_plan()) == 800
@@ -0,0 +1,122 @@
+import io
+from datetime import date
+
+import pytest
+
+from pawpal_snapshot import Snapshot, write_snapshot
+from pawpal_system import Owner, Pet, Task
+
+
+def build_owners() -> list:
+	owner_a = Owner("Jordan")
+	owner_b = Owner("Sam")
+	milo = Pet("Milo")
+	luna = Pet("Luna")
+	rex = Pet("Rex")
+	owner_a.add_pet(milo)
+	owner_a.add_pet(luna)
+	owner_b.add_pet(rex)
+	milo.add_task(
+		Task(
+			name="Walk",
+			description="Morning walk",
+			duration=30,
+			priority=2,
+			status=Task.STATUS_PENDING,
+			due_time=450,
+			recurrence="daily",
+			last_completed_date=date(2024, 3, 1),
+			next_due_date=date(2024, 3, 2),
+		)
+	)
+	milo.add_task(Task(name="Brush", description="Fur", duration=10, priority=1, status=Task.STATUS_IN_PROGRESS))
+	luna.add_task(Task(name="Meds", description="Pill", duration=5, priority=3, status=Task.STATUS_COMPLETED))
+	rex.add_task(Task(name="Walk", description="Evening walk 🐾", duration=20, priority=2, status=Task.STATUS_PENDING, due_time=1080))
+	return [owner_a, owner_b]
+
+
+def test_snapshot_roundtrip(tmp_path) -> None:
+	# Arrange
+	path = str(tmp_path / "household.pawpal")
+	write_snapshot(path, build_owners())
+
+	# Act
+	with Snapshot(path) as snapshot:
+		owners = list(snapshot.owners())
+
+	# Assert
+	assert [owner.name for owner in owners] == ["Jordan", "Sam"]
+	milo = owners[0].owned_pets[0]
+	assert milo.owner is owners[0]
+	walk = milo.get_task("Walk")
+	assert walk is not None
+	assert walk.due_time == 450
+	assert walk.recurrence == "daily"
+	assert walk.last_completed_date == date(2024, 3, 1)
+	assert walk.next_due_date == date(2024, 3, 2)
+	assert milo.get_task("Brush").due_time is None
+	assert owners[1].owned_pets[0].get_task("Walk").description == "Evening walk 🐾"
+
+
+def test_snapshot_builds_tasks_lazily(tmp_path) -> None:
+	# Arrange
+	path = str(tmp_path / "household.pawpal")
+	write_snapshot(path, build_owners())
+
+	# Act
+	with Snapshot(path) as snapshot:
+		before = snapshot.materialized_task_count
+		last = snapshot.tasks[-1]
+		after = snapshot.materialized_task_count
+
+	# Assert
+	assert snapshot.task_count == 4
+	assert before == 0
+	assert after == 1
+	assert last.name == "Walk" and last.due_time == 1080
+
+
+def test_snapshot_rejects_unknown_format(tmp_path) -> None:
+	# Arrange
+	buffer = io.BytesIO()
+	write_snapshot(buffer, build_owners())
+	data = bytearray(buffer.getvalue())
+	data[:8] = b"NOTPAWPL"
+	path = tmp_path / "bad.pawpal"
+	path.write_bytes(bytes(data))
+
+	# Act / Assert
+	with pytest.raises(ValueError):
+		Snapshot(str(path))
+
+
+def test_snapshot_pet_links_owner_without_building_siblings(tmp_path) -> None:
+	# Arrange
+	path = str(tmp_path / "household.pawpal")
+	write_snapshot(path, build_owners())
+
+	# Act
+	with Snapshot(path) as snapshot:
+		milo = snapshot.pet(0)
+		before = snapshot.materialized_task_count
+		siblings = [pet.name for pet in milo.owner.owned_pets]
+		after = snapshot.materialized_task_count
+
+	# Assert
+	assert milo.owner.name == "Jordan"
+	assert before == 2
+	assert siblings == ["Milo", "Luna"]
+	assert milo.owner.owned_pets[0] is milo
+	assert after == 3
+
+
+def test_snapshot_rejects_truncated_file(tmp_path) -> None:
+	# Arrange
+	buffer = io.BytesIO()
+	write_snapshot(buffer, build_owners())
+	path = tmp_path / "truncated.pawpal"
+	path.write_bytes(buffer.getvalue()[:-4])
+
+	# Act / Assert
+	with pytest.raises(ValueError):
+		Snapshot(str(path))